@@ -15,11 +15,101 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import os
+import struct
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from itertools import accumulate
 
 logger = logging.getLogger("guardian_oracle.proof_generator")
 
+DIGEST_SIZE = 32  # SHA-256 digest length in bytes
+
+
+def _hash_level(view: memoryview, n_nodes: int) -> None:
+    """
+    Hash one tree level of packed 32-byte digests pairwise, in place.
+
+    The first `n_nodes` digests of `view` (an even count) are replaced by
+    their `n_nodes // 2` parents, written to the front of the buffer.
+    Parent `i` is written over bytes that children `2i`/`2i + 1` have
+    already been read from, so no scratch copy is needed. hashlib
+    dispatches to OpenSSL, which already uses SHA-NI / ARMv8 crypto
+    instructions when the CPU has them.
+    """
+    sha256 = hashlib.sha256
+    for i in range(n_nodes // 2):
+        parent = i * DIGEST_SIZE
+        child = 2 * parent
+        view[parent:parent + DIGEST_SIZE] = sha256(view[child:child + 2 * DIGEST_SIZE]).digest()
+
+
+# Fixed-width little-endian layouts for the known sensor log schemas.
+# The leading tag byte keeps the encodings of different schemas — and
+# the JSON fallback (tag 0) — from ever colliding.
+_ENTRY_LAYOUTS: dict[str, tuple[int, tuple[str, ...], struct.Struct]] = {
+    "chemical": (
+        1,
+        ("cortisol", "lactate", "timestamp"),
+        struct.Struct("<B3d"),
+    ),
+    "active_cycle": (
+        2,
+        (
+            "timestamp", "cortisol", "lactate", "turbidity_ntu",
+            "biomass_gel", "biomass_com", "stress_score", "confidence",
+            "weight_chemical", "weight_vision", "twis", "vision_inference_ms",
+        ),
+        struct.Struct("<B12d"),
+    ),
+}
+_JSON_ENTRY_TAG = b"\x00"
+
+
+def pack_entry(entry: dict) -> bytes:
+    """
+    Canonical binary encoding of a sensor log entry (the leaf preimage).
+
+    Entries matching a known schema exactly, with every value a float,
+    are packed as a tag byte plus fixed-width doubles (25 bytes for a
+    chemical poll instead of ~90 bytes of JSON). Anything else — unknown
+    types, extra keys, int or bool values — falls back to a tag byte plus
+    sorted-key JSON, so every field and its type are committed to
+    (`{"x": True}` and `{"x": 1.0}` never share a leaf).
+    """
+    layout = _ENTRY_LAYOUTS.get(entry.get("type"))
+    if layout is not None:
+        tag, fields, packer = layout
+        if len(entry) == len(fields) + 1:
+            values = [entry.get(name) for name in fields]
+            if all(isinstance(value, float) for value in values):
+                return packer.pack(tag, *values)
+
+    serialized = json.dumps(entry, sort_keys=True, default=str)
+    return _JSON_ENTRY_TAG + serialized.encode("utf-8")
+
+
+def hash_leaf(entry: dict) -> bytes:
+    """SHA-256 leaf digest of a single sensor log entry."""
+    return hashlib.sha256(pack_entry(entry)).digest()
+
+
+def _hash_leaves(buf: bytes, offsets: list[int]) -> bytes:
+    """
+    Hash every record of a packed buffer, returning the packed leaf digests.
+
+    Record `i` spans `buf[offsets[i]:offsets[i + 1]]`, so `offsets` holds
+    one more entry than there are records.
+    """
+    sha256 = hashlib.sha256
+    view = memoryview(buf)
+    return b"".join(
+        sha256(view[start:end]).digest()
+        for start, end in zip(offsets, offsets[1:])
+    )
+
 
 @dataclass
 class CompactProof:
@@ -41,55 +131,144 @@ class MerkleTree:
     """
     A simple binary Merkle tree built from SHA-256 leaf hashes.
     
-    Each leaf is the SHA-256 hash of a JSON-serialized sensor log entry.
-    Internal nodes are the SHA-256 hash of their two children concatenated.
+    Each leaf is the SHA-256 hash of a packed sensor log entry (see
+    `pack_entry`). Internal nodes are the SHA-256 hash of their two children's raw
+    digests concatenated (64 bytes per node). Leaves and nodes are kept
+    as raw 32-byte digests; only the root is hex-encoded, on the way out.
     """
 
-    def __init__(self, leaves: list[str]):
+    def __init__(self, leaves: list[bytes]):
         """
         Args:
-            leaves: List of hex-encoded SHA-256 leaf hashes.
+            leaves: List of raw 32-byte SHA-256 leaf digests.
         """
-        if not leaves:
+        self._leaves = b"".join(leaves)
+        if not self._leaves:
             raise ValueError("Cannot build Merkle tree with zero leaves")
+        self._root = self._build(self._leaves)
 
-        self._leaves = leaves
-        self._root = self._build(leaves)
+    @classmethod
+    def from_digests(cls, digests: bytes) -> MerkleTree:
+        """
+        Build a tree from raw leaf digests packed back to back.
 
-    @staticmethod
-    def hash_data(data: str) -> str:
-        """SHA-256 hash of a string, returned as hex."""
-        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+        Args:
+            digests: Concatenated 32-byte SHA-256 leaf digests.
+        """
+        if len(digests) % DIGEST_SIZE:
+            raise ValueError(
+                f"Packed digests must be a multiple of {DIGEST_SIZE} bytes, "
+                f"got {len(digests)}"
+            )
+        return cls([bytes(digests)])
 
     @staticmethod
-    def hash_pair(left: str, right: str) -> str:
-        """SHA-256 hash of two hex hashes concatenated."""
-        combined = left + right
-        return hashlib.sha256(combined.encode("utf-8")).hexdigest()
+    def _build(leaves: bytes) -> bytes:
+        """Reduce the packed leaf digests level by level, returning the root digest."""
+        n_nodes = len(leaves) // DIGEST_SIZE
+
+        # One scratch buffer for every level, with room to duplicate a node
+        buf = bytearray(len(leaves) + DIGEST_SIZE)
+        buf[:len(leaves)] = leaves
+        view = memoryview(buf)
+
+        while n_nodes > 1:
+            # If odd number of nodes, duplicate the last
+            if n_nodes % 2 == 1:
+                end = n_nodes * DIGEST_SIZE
+                view[end:end + DIGEST_SIZE] = view[end - DIGEST_SIZE:end]
+                n_nodes += 1
+
+            _hash_level(view, n_nodes)
+            n_nodes //= 2
+
+        return bytes(view[:DIGEST_SIZE])
+
+    @property
+    def root(self) -> str:
+        """Hex-encoded root — the only place the tree leaves binary."""
+        return self._root.hex()
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self._leaves) // DIGEST_SIZE
+
 
-    def _build(self, nodes: list[str]) -> str:
-        """Recursively build the tree, returning the root hash."""
-        if len(nodes) == 1:
-            return nodes[0]
+class IncrementalMerkle:
+    """
+    Append-only Merkle tree that only keeps its right-hand frontier.
+
+    `_frontier[i]` holds the root of the pending complete subtree of
+    2**i leaves, or None. Appending a leaf costs O(log N) hashes and the
+    root is folded from the frontier in O(log N), so a commitment over
+    the whole log never requires re-hashing historical entries.
+
+    The root is identical to MerkleTree's over the same leaves,
+    including its "duplicate the last node" rule for odd levels.
+    """
 
-        # If odd number of nodes, duplicate the last
-        if len(nodes) % 2 == 1:
-            nodes = nodes + [nodes[-1]]
+    def __init__(self):
+        self._frontier: list[bytes | None] = []
+        self._leaf_count = 0
 
-        # Pairwise hash
-        parent_level = []
-        for i in range(0, len(nodes), 2):
-            parent_level.append(self.hash_pair(nodes[i], nodes[i + 1]))
+    def append(self, leaf: bytes) -> None:
+        """
+        Add one leaf to the tree.
 
-        return self._build(parent_level)
+        Args:
+            leaf: Raw 32-byte SHA-256 leaf digest (see `hash_leaf`).
+        """
+        frontier = self._frontier
+        sha256 = hashlib.sha256
+        node = leaf
+        level = 0
+        while level < len(frontier) and frontier[level] is not None:
+            node = sha256(frontier[level] + node).digest()
+            frontier[level] = None
+            level += 1
+
+        if level == len(frontier):
+            frontier.append(node)
+        else:
+            frontier[level] = node
+        self._leaf_count += 1
+
+    def snapshot(self) -> IncrementalMerkle:
+        """O(log N) copy that later appends to this tree do not affect."""
+        copy = IncrementalMerkle()
+        copy._frontier = list(self._frontier)
+        copy._leaf_count = self._leaf_count
+        return copy
+
+    def _root_digest(self) -> bytes:
+        """Fold the frontier bottom-up into the root digest."""
+        sha256 = hashlib.sha256
+        frontier = self._frontier
+        partial: bytes | None = None  # Last node of a level, if incomplete
+        level = 0
+
+        while (1 << level) < self._leaf_count:
+            complete = frontier[level]
+            if partial is None:
+                if complete is not None:
+                    partial = sha256(complete + complete).digest()
+            elif complete is not None:
+                partial = sha256(complete + partial).digest()
+            else:
+                partial = sha256(partial + partial).digest()
+            level += 1
+
+        return partial if partial is not None else frontier[level]
 
     @property
     def root(self) -> str:
-        return self._root
+        if not self._leaf_count:
+            raise ValueError("Cannot compute root of an empty Merkle tree")
+        return self._root_digest().hex()
 
     @property
     def leaf_count(self) -> int:
-        return len(self._leaves)
+        return self._leaf_count
 
 
 class ProofGenerator:
@@ -102,9 +281,24 @@ class ProofGenerator:
     HASH_SIZE_BYTES = 32            # SHA-256 = 32 bytes
     HEADER_BYTES = 8                # Protocol overhead (timestamp + leaf count)
 
-    def __init__(self):
+    # Logs with at least this many entries are leaf-hashed in parallel
+    # chunks when an executor is supplied
+    PARALLEL_MIN_LEAVES = 4096
+
+    def __init__(self, executor: Executor | None = None, max_proofs: int = 1024):
+        """
+        Args:
+            executor: Optional pool used to hash the leaves of large logs
+                (e.g. the full dump verified on surfacing) in parallel.
+                hashlib only releases the GIL for inputs of 2 KiB or more,
+                so leaf-sized inputs need a ProcessPoolExecutor to scale.
+            max_proofs: Number of most recent proofs retained in `proofs`
+                (about a week at one per 10 minutes). `proof_count`
+                still counts every proof sent.
+        """
         self._proof_count = 0
-        self._proofs: list[CompactProof] = []
+        self._proofs: deque[CompactProof] = deque(maxlen=max_proofs)
+        self._executor = executor
 
     @property
     def proof_count(self) -> int:
@@ -112,13 +306,21 @@ class ProofGenerator:
 
     @property
     def proofs(self) -> list[CompactProof]:
+        """Retained proofs, oldest first."""
         return list(self._proofs)
 
+    def clear(self) -> None:
+        """Forget all proofs, keeping the executor and history bound."""
+        self._proof_count = 0
+        self._proofs.clear()
+
     def build_merkle_tree(self, log_entries: list[dict]) -> MerkleTree:
         """
         Build a Merkle tree from a list of sensor log dictionaries.
         
-        Each entry is JSON-serialized and SHA-256 hashed to form a leaf.
+        Each entry is packed with `pack_entry` and SHA-256 hashed to form a
+        leaf. All entries are packed into one buffer first so the leaves
+        are hashed in a single pass over contiguous memory.
         
         Args:
             log_entries: List of sensor log dictionaries.
@@ -129,15 +331,45 @@ class ProofGenerator:
         if not log_entries:
             raise ValueError("Cannot build proof from empty log")
 
-        leaves = []
-        for entry in log_entries:
-            serialized = json.dumps(entry, sort_keys=True, default=str)
-            leaf_hash = MerkleTree.hash_data(serialized)
-            leaves.append(leaf_hash)
+        packed = [pack_entry(entry) for entry in log_entries]
+        buf = b"".join(packed)
+        offsets = [0, *accumulate(map(len, packed))]
 
-        return MerkleTree(leaves)
+        if self._executor is not None and len(packed) >= self.PARALLEL_MIN_LEAVES:
+            digests = self._hash_leaves_parallel(buf, offsets)
+        else:
+            digests = _hash_leaves(buf, offsets)
 
-    def generate_compact_proof(self, tree: MerkleTree) -> CompactProof:
+        return MerkleTree.from_digests(digests)
+
+    def _hash_leaves_parallel(self, buf: bytes, offsets: list[int]) -> bytes:
+        """Split the packed log into one contiguous chunk per core and hash them concurrently."""
+        n_leaves = len(offsets) - 1
+        chunk_size = -(-n_leaves // (os.cpu_count() or 1))
+
+        futures = []
+        for first in range(0, n_leaves, chunk_size):
+            last = min(first + chunk_size, n_leaves)
+            base = offsets[first]
+            chunk_offsets = [offset - base for offset in offsets[first:last + 1]]
+            futures.append(self._executor.submit(
+                _hash_leaves, buf[base:offsets[last]], chunk_offsets,
+            ))
+
+        return b"".join(future.result() for future in futures)
+
+    def verify_root(self, log_entries: list[dict], merkle_root: str) -> bool:
+        """
+        Check a committed root against a full rebuild of the dumped log.
+
+        Used on surfacing, once the complete dataset is available over
+        the optical link.
+        """
+        return self.build_merkle_tree(log_entries).root == merkle_root
+
+    def generate_compact_proof(
+        self, tree: MerkleTree | IncrementalMerkle
+    ) -> CompactProof:
         """
         Generate a compact proof from a Merkle tree for acoustic transmission.
         
@@ -196,6 +428,17 @@ class ProofGenerator:
             dict with transmission result including merkle_root.
         """
         tree = self.build_merkle_tree(log_entries)
+        return self.send(tree)
+
+    def send(self, tree: MerkleTree | IncrementalMerkle) -> dict:
+        """
+        Generate a proof from an already-built tree and simulate sending it.
+
+        With an IncrementalMerkle this is O(log N) — no leaf is re-hashed.
+
+        Returns:
+            dict with transmission result including merkle_root.
+        """
         proof = self.generate_compact_proof(tree)
         result = self.simulate_acoustic_send(proof)
         return result
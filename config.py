@@ -0,0 +1,17 @@
+"""
+Guardian Oracle TAM — Runtime Configuration
+
+Resolves the run mode once at startup. When `demo_mode.flag` is present
+in the project root, the system loops simulated sensor data instead of
+attempting to connect to real hardware. Import `IS_DEMO_MODE` from here
+rather than re-checking the filesystem.
+"""
+
+from __future__ import annotations
+
+import os
+
+_THIS_DIR = os.path.dirname(__file__)
+
+DEMO_FLAG_PATH = os.path.join(_THIS_DIR, "demo_mode.flag")
+IS_DEMO_MODE = os.path.isfile(DEMO_FLAG_PATH)
@@ -15,8 +15,10 @@ import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from typing import Any
+from enum import Enum, IntEnum, auto
+from typing import Any, Callable
+
+import numpy as np
 
 from sensors.chemical_sensor import ChemicalSensor, ChemicalReading, CORTISOL_LIMIT, StressScenario
 from sensors.optical_sensor import OpticalSensor
@@ -24,7 +26,8 @@ from sensors.turbidity_sensor import TurbiditySensor, TURBIDITY_THRESHOLD
 from ai_models.sensor_fusion import fuse, FusedReading
 from ai_models.vision_model import VisionModel, VisionResult
 from edge_node.twis import calculate_twis
-from blockchain.proof_generator import ProofGenerator
+from blockchain.proof_generator import IncrementalMerkle, ProofGenerator, hash_leaf
+from edge_node.sensor_log import SensorLogRing
 
 logger = logging.getLogger("guardian_oracle.state_machine")
 
@@ -36,13 +39,35 @@ class PowerState(Enum):
     TRANSMIT = auto()   # Acoustic transmission — sending Merkle hash
 
 
+class EventKind(IntEnum):
+    """Kinds of edge node events recorded in the event log."""
+    SYSTEM_START = auto()
+    SYSTEM_STOP = auto()
+    DURATION_EXPIRED = auto()
+    CANCELLED = auto()
+    TRANSITION = auto()
+    IDLE_ENTER = auto()
+    IDLE_POLL = auto()
+    ACTIVE_ENTER = auto()
+    GPU_WAKE = auto()
+    ACTIVE_CYCLE = auto()
+    TRANSMIT_ENTER = auto()
+    MERKLE_HASH_SENT = auto()
+
+
 @dataclass
 class EventLogEntry:
     """A single entry in the edge node event log."""
     timestamp: float
     state: str
-    event: str
+    kind: EventKind
     data: dict[str, Any] = field(default_factory=dict)
+    prev_state: str | None = None  # Set for transitions
+
+    @property
+    def event(self) -> str:
+        """Human-readable event name (rendered on access)."""
+        return _event_text(self.kind, self.state, self.prev_state)
 
     def to_dict(self) -> dict:
         return {
@@ -53,6 +78,13 @@ class EventLogEntry:
         }
 
 
+def _event_text(kind: EventKind, state: str, prev_state: str | None) -> str:
+    """Human-readable event name, as shown in the event log."""
+    if kind is EventKind.TRANSITION:
+        return f"TRANSITION: {prev_state} → {state}"
+    return kind.name
+
+
 class EdgeController:
     """
     Main edge node controller implementing the Wake-on-Event state machine.
@@ -73,6 +105,8 @@ class EdgeController:
         active_poll_interval: float = 2.0,
         transmit_interval: float = 600.0,  # 10 minutes
         idle_return_threshold: int = 3,
+        sensor_log_capacity: int = 8192,
+        event_log_capacity: int = 4096,
     ):
         # Sensors
         self.chem_sensor = ChemicalSensor()
@@ -84,11 +118,15 @@ class EdgeController:
 
         # Blockchain
         self.proof_generator = ProofGenerator()
+        self.incremental_tree = IncrementalMerkle()
 
         # State
         self._state = PowerState.IDLE
         self._running = False
         self._low_cortisol_streak = 0
+        self._transition_event = asyncio.Event()  # Set on every state change
+        self._transition_counts: dict[tuple[PowerState, PowerState], int] = {}
+        self._stop_when: Callable[[EdgeController], bool] | None = None  # Checked on every event
 
         # Timing
         self._idle_poll_interval = idle_poll_interval
@@ -98,31 +136,151 @@ class EdgeController:
         self._last_transmit_time = 0.0
 
         # Logs
-        self.event_log: list[EventLogEntry] = []
-        self.sensor_log: list[dict] = []
-        self.twis_history: list[float] = []
+        # Events are kept as raw (monotonic_ns, kind, state, prev_state, data)
+        # records in a preallocated ring and only formatted when read.
+        self._evt_ring: list[tuple | None] = [None] * event_log_capacity
+        self._evt_head = 0
+        self._event_views: dict[str, list] = {}  # Built on read, dropped on record
+        self._wall_anchor = time.time()
+        self._mono_anchor_ns = time.monotonic_ns()
+        self._sensor_ring = SensorLogRing(sensor_log_capacity)
 
     @property
     def state(self) -> PowerState:
         return self._state
 
-    def _log_event(self, event: str, **data: Any) -> None:
-        entry = EventLogEntry(
-            timestamp=time.time(),
-            state=self._state.name,
-            event=event,
-            data=data,
+    @property
+    def transition_counts(self) -> dict[tuple[PowerState, PowerState], int]:
+        """Number of transitions made, keyed by (from_state, to_state)."""
+        return dict(self._transition_counts)
+
+    @property
+    def transitions(self) -> list[tuple[PowerState, PowerState]]:
+        """
+        Retained transitions as (from_state, to_state), oldest first.
+
+        Cached until the next event is recorded; treat it as read-only.
+        """
+        view = self._event_views.get("transitions")
+        if view is None:
+            view = self._event_views["transitions"] = [
+                (prev_state, state)
+                for _, kind, state, prev_state, _ in self._event_records()
+                if kind is EventKind.TRANSITION
+            ]
+        return view
+
+    @property
+    def sensor_log(self) -> list[dict]:
+        """
+        Retained sensor log entries, oldest first (built on demand).
+
+        Complete — and so verifiable against a transmitted root — only
+        until the ring wraps; a warning is logged when it does.
+        """
+        return self._sensor_ring.to_dicts()
+
+    def sensor_rows(self, entry_type: str | None = None) -> np.ndarray:
+        """
+        Retained sensor log as columns (structured array), oldest first.
+
+        Args:
+            entry_type: Only return entries of this type (e.g. "active_cycle").
+        """
+        return self._sensor_ring.rows(entry_type)
+
+    def stressed_mask(self) -> np.ndarray:
+        """Boolean mask over sensor_rows(): cortisol above CORTISOL_LIMIT."""
+        return self._sensor_ring.rows()["cortisol"] > CORTISOL_LIMIT
+
+    @property
+    def twis_history(self) -> np.ndarray:
+        """TWIS scores of the retained ACTIVE cycles, oldest first."""
+        return self._sensor_ring.rows("active_cycle")["twis"]
+
+    def _record_event(
+        self,
+        kind: EventKind,
+        data: dict[str, Any],
+        prev_state: PowerState | None = None,
+    ) -> None:
+        self._evt_ring[self._evt_head % len(self._evt_ring)] = (
+            time.monotonic_ns(), kind, self._state, prev_state, data,
         )
-        self.event_log.append(entry)
-        logger.info(f"[{self._state.name}] {event} | {data}")
+        self._evt_head += 1
+        self._event_views.clear()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "[%s] %s | %s",
+                self._state.name,
+                _event_text(kind, self._state.name, prev_state and prev_state.name),
+                data,
+            )
+        if self._stop_when is not None and self._stop_when(self):
+            self._running = False
+
+    def _log_event(self, kind: EventKind, **data: Any) -> None:
+        self._record_event(kind, data)
+
+    def _event_records(self) -> list[tuple]:
+        """Retained raw event records, oldest first."""
+        capacity = len(self._evt_ring)
+        if self._evt_head <= capacity:
+            return self._evt_ring[:self._evt_head]
+        start = self._evt_head % capacity
+        return self._evt_ring[start:] + self._evt_ring[:start]
+
+    @property
+    def event_log(self) -> list[EventLogEntry]:
+        """
+        Retained events, oldest first (formatted on demand).
+
+        Cached until the next event is recorded; treat it as read-only.
+        """
+        view = self._event_views.get("event_log")
+        if view is None:
+            view = self._event_views["event_log"] = [
+                EventLogEntry(
+                    timestamp=self._wall_anchor + (t_ns - self._mono_anchor_ns) / 1e9,
+                    state=state.name,
+                    kind=kind,
+                    data=data,
+                    prev_state=prev_state and prev_state.name,
+                )
+                for t_ns, kind, state, prev_state, data in self._event_records()
+            ]
+        return view
+
+    def dump_events(self) -> list[str]:
+        """Render the retained events as human-readable log lines."""
+        return [
+            f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(e.timestamp))} "
+            f"[{e.state}] {e.event} | {e.data}"
+            for e in self.event_log
+        ]
+
+    def _record_sensor_entry(self, entry: dict) -> None:
+        """Append a sensor log entry and fold its leaf into the Merkle tree."""
+        # The ring stores float64 columns; ints (e.g. from a sim clock) are widened
+        entry = {k: v if k == "type" else float(v) for k, v in entry.items()}
+        ring = self._sensor_ring
+        if ring.total_appended == ring.capacity:
+            logger.warning(
+                "Sensor log full (%d entries): overwriting the oldest. The "
+                "dumped log no longer covers the Merkle tree, so transmitted "
+                "roots cannot be verified against it.",
+                ring.capacity,
+            )
+        ring.append(entry)
+        self.incremental_tree.append(hash_leaf(entry))
 
     def _transition(self, new_state: PowerState, reason: str) -> None:
         old_state = self._state
         self._state = new_state
-        self._log_event(
-            f"TRANSITION: {old_state.name} → {new_state.name}",
-            reason=reason,
-        )
+        self._record_event(EventKind.TRANSITION, {"reason": reason}, old_state)
+        key = (old_state, new_state)
+        self._transition_counts[key] = self._transition_counts.get(key, 0) + 1
+        self._transition_event.set()
 
     # ──────────────── IDLE State ────────────────
 
@@ -131,12 +289,13 @@ class EdgeController:
         Low-power polling loop. Only the chemical sensor is active.
         Transitions to ACTIVE when cortisol exceeds the limit.
         """
-        self._log_event("IDLE_ENTER", power_mw=50)
+        self._log_event(EventKind.IDLE_ENTER, power_mw=50)
 
         while self._running and self._state == PowerState.IDLE:
-            reading: ChemicalReading = await self.chem_sensor.read()
+            now = sim_time_getter() if sim_time_getter else time.time()
+            reading: ChemicalReading = await self.chem_sensor.read(now)
 
-            self.sensor_log.append({
+            self._record_sensor_entry({
                 "type": "chemical",
                 "cortisol": reading.cortisol_ng_ml,
                 "lactate": reading.lactate_mmol_l,
@@ -144,7 +303,7 @@ class EdgeController:
             })
 
             self._log_event(
-                "IDLE_POLL",
+                EventKind.IDLE_POLL,
                 cortisol=reading.cortisol_ng_ml,
                 lactate=reading.lactate_mmol_l,
             )
@@ -158,113 +317,134 @@ class EdgeController:
 
     # ──────────────── ACTIVE State ────────────────
 
+    def _read_sensors(self, now: float) -> asyncio.Future:
+        """Concurrent chemical + turbidity read, both stamped with `now`."""
+        return asyncio.gather(
+            self.chem_sensor.read(now),
+            self.turbidity_sensor.read(now),
+        )
+
     async def _active_loop(self, sim_time_getter=None) -> None:
         """
         Full-power loop. GPU is awake, running vision + fusion + TWIS.
+        Chemical and turbidity reads are double-buffered: the next
+        cycle's reads start as soon as the current ones arrive, so their
+        ADC delay overlaps vision, fusion and the poll sleep. Each log
+        entry carries the timestamp of the reading it records.
         Transitions to TRANSMIT every 10 minutes.
         Transitions back to IDLE after 3 consecutive low-cortisol reads.
         """
-        self._log_event("ACTIVE_ENTER", power_w=15)
+        self._log_event(EventKind.ACTIVE_ENTER, power_w=15)
 
         # Wake up the GPU and load the vision model
         if not self.vision_model.is_loaded:
             await self.vision_model.load()
-            self._log_event("GPU_WAKE", model="CNN-LSTM loaded")
-
-        while self._running and self._state == PowerState.ACTIVE:
-            # 1. Read all sensors concurrently
-            chem_reading, turb_reading = await asyncio.gather(
-                self.chem_sensor.read(),
-                self.turbidity_sensor.read(),
-            )
-
-            # 2. Update optical sensor's turbidity awareness
-            self.optical_sensor.turbidity_factor = min(1.0, turb_reading.ntu / 100.0)
-
-            # 3. Run vision model
-            opt_reading = await self.optical_sensor.capture()
-            vision_result: VisionResult = await self.vision_model.infer(
-                frame_id=opt_reading.frame_id,
-                gelatinous_hint=opt_reading.biomass_gelatinous,
-                commercial_hint=opt_reading.biomass_commercial,
-            )
-
-            # 4. Sensor fusion
-            fused: FusedReading = fuse(
-                turbidity_ntu=turb_reading.ntu,
-                cortisol=chem_reading.cortisol_ng_ml,
-                lactate=chem_reading.lactate_mmol_l,
-                biomass_gelatinous=vision_result.biomass_gelatinous_kg,
-                biomass_commercial=vision_result.biomass_commercial_kg,
-                vision_quality=opt_reading.quality_score,
-            )
-
-            # 5. Calculate TWIS
-            twis = calculate_twis(
-                fused.biomass_gelatinous,
-                fused.biomass_commercial,
-            )
-            self.twis_history.append(twis)
-
-            # 6. Log everything
-            log_entry = {
-                "type": "active_cycle",
-                "timestamp": time.time(),
-                "cortisol": chem_reading.cortisol_ng_ml,
-                "lactate": chem_reading.lactate_mmol_l,
-                "turbidity_ntu": turb_reading.ntu,
-                "biomass_gel": fused.biomass_gelatinous,
-                "biomass_com": fused.biomass_commercial,
-                "stress_score": fused.stress_score,
-                "confidence": fused.confidence,
-                "weight_chemical": fused.weight_chemical,
-                "weight_vision": fused.weight_vision,
-                "twis": twis,
-                "vision_inference_ms": vision_result.inference_time_ms,
-            }
-            self.sensor_log.append(log_entry)
-
-            self._log_event(
-                "ACTIVE_CYCLE",
-                twis=twis,
-                stress=fused.stress_score,
-                w_chem=fused.weight_chemical,
-                cortisol=chem_reading.cortisol_ng_ml,
-                turbidity=turb_reading.ntu,
-            )
+            self._log_event(EventKind.GPU_WAKE, model="CNN-LSTM loaded")
 
-            # 7. Check for IDLE return condition
-            if not chem_reading.is_stressed:
-                self._low_cortisol_streak += 1
-                if self._low_cortisol_streak >= self._idle_return_threshold:
-                    self.vision_model.unload()
-                    self._transition(PowerState.IDLE, f"Cortisol low for {self._idle_return_threshold} consecutive reads")
+        clock = sim_time_getter or time.time
+        pending_reads = self._read_sensors(clock())
+        try:
+            while self._running and self._state == PowerState.ACTIVE:
+                # 1. Take this cycle's reads and start the next cycle's
+                chem_reading, turb_reading = await pending_reads
+                now = chem_reading.timestamp
+                pending_reads = self._read_sensors(clock())
+
+                # 2. Update optical sensor's turbidity awareness
+                self.optical_sensor.turbidity_factor = turb_reading.ntu / 100.0  # Setter clamps to [0, 1]
+
+                # 3. Capture a frame and run the vision model
+                opt_reading = await self.optical_sensor.capture(now=now)
+                vision_result: VisionResult = await self.vision_model.infer(
+                    frame_id=opt_reading.frame_id,
+                    gelatinous_hint=opt_reading.biomass_gelatinous,
+                    commercial_hint=opt_reading.biomass_commercial,
+                )
+
+                # 4. Sensor fusion
+                fused: FusedReading = fuse(
+                    turbidity_ntu=turb_reading.ntu,
+                    cortisol=chem_reading.cortisol_ng_ml,
+                    lactate=chem_reading.lactate_mmol_l,
+                    biomass_gelatinous=vision_result.biomass_gelatinous_kg,
+                    biomass_commercial=vision_result.biomass_commercial_kg,
+                    vision_quality=opt_reading.quality_score,
+                )
+
+                # 5. Calculate TWIS
+                twis = calculate_twis(
+                    fused.biomass_gelatinous,
+                    fused.biomass_commercial,
+                )
+
+                # 6. Log everything
+                log_entry = {
+                    "type": "active_cycle",
+                    "timestamp": now,
+                    "cortisol": chem_reading.cortisol_ng_ml,
+                    "lactate": chem_reading.lactate_mmol_l,
+                    "turbidity_ntu": turb_reading.ntu,
+                    "biomass_gel": fused.biomass_gelatinous,
+                    "biomass_com": fused.biomass_commercial,
+                    "stress_score": fused.stress_score,
+                    "confidence": fused.confidence,
+                    "weight_chemical": fused.weight_chemical,
+                    "weight_vision": fused.weight_vision,
+                    "twis": twis,
+                    "vision_inference_ms": vision_result.inference_time_ms,
+                }
+                self._record_sensor_entry(log_entry)
+
+                self._log_event(
+                    EventKind.ACTIVE_CYCLE,
+                    twis=twis,
+                    stress=fused.stress_score,
+                    w_chem=fused.weight_chemical,
+                    cortisol=chem_reading.cortisol_ng_ml,
+                    turbidity=turb_reading.ntu,
+                )
+
+                # 7. Check for IDLE return condition
+                if not chem_reading.is_stressed:
+                    self._low_cortisol_streak += 1
+                    if self._low_cortisol_streak >= self._idle_return_threshold:
+                        self.vision_model.unload()
+                        self._transition(PowerState.IDLE, f"Cortisol low for {self._idle_return_threshold} consecutive reads")
+                        return
+                else:
+                    self._low_cortisol_streak = 0
+
+                # 8. Check for TRANSMIT condition
+                if clock() - self._last_transmit_time >= self._transmit_interval:
+                    self._transition(PowerState.TRANSMIT, "Transmit interval reached")
                     return
-            else:
-                self._low_cortisol_streak = 0
-
-            # 8. Check for TRANSMIT condition
-            current_time = sim_time_getter() if sim_time_getter else time.time()
-            if current_time - self._last_transmit_time >= self._transmit_interval:
-                self._transition(PowerState.TRANSMIT, "Transmit interval reached")
-                return
 
-            await asyncio.sleep(self._active_poll_interval)
+                await asyncio.sleep(self._active_poll_interval)
+        finally:
+            # Drop the reads prefetched for a cycle that will not run
+            pending_reads.cancel()
+            await asyncio.gather(pending_reads, return_exceptions=True)
 
     # ──────────────── TRANSMIT State ────────────────
 
     async def _transmit_loop(self, sim_time_getter=None) -> None:
         """
-        Build a Merkle tree from recent sensor logs and simulate
-        acoustic transmission of the compact proof.
+        Commit to the accumulated sensor logs and simulate acoustic
+        transmission of the compact proof.
+
+        The Merkle tree is maintained incrementally as entries are logged,
+        so only its O(log N) frontier is folded here. Proof generation and
+        the (blocking) modem send run in a worker thread on a snapshot of
+        the tree, keeping the event loop responsive.
         """
-        self._log_event("TRANSMIT_ENTER")
+        self._log_event(EventKind.TRANSMIT_ENTER)
 
-        # Build proof from accumulated sensor logs
-        proof = self.proof_generator.build_and_send(self.sensor_log)
+        proof = await asyncio.to_thread(
+            self.proof_generator.send, self.incremental_tree.snapshot()
+        )
 
         self._log_event(
-            "MERKLE_HASH_SENT",
+            EventKind.MERKLE_HASH_SENT,
             merkle_root=proof["merkle_root"],
             leaf_count=proof["leaf_count"],
             transmission_bytes=proof["transmission_bytes"],
@@ -289,12 +469,12 @@ class EdgeController:
         self._last_transmit_time = sim_time_getter() if sim_time_getter else time.time()
         start_time = time.monotonic()
 
-        self._log_event("SYSTEM_START", duration=duration)
+        self._log_event(EventKind.SYSTEM_START, duration=duration)
 
         try:
             while self._running:
                 if duration and (time.monotonic() - start_time) >= duration:
-                    self._log_event("DURATION_EXPIRED")
+                    self._log_event(EventKind.DURATION_EXPIRED)
                     break
 
                 if self._state == PowerState.IDLE:
@@ -305,23 +485,116 @@ class EdgeController:
                     await self._transmit_loop(sim_time_getter)
 
         except asyncio.CancelledError:
-            self._log_event("CANCELLED")
+            self._log_event(EventKind.CANCELLED)
         finally:
             self._running = False
-            self._log_event("SYSTEM_STOP", total_events=len(self.event_log))
+            self._log_event(EventKind.SYSTEM_STOP, total_events=self._evt_head)
+
+    async def run_until(
+        self,
+        predicate: Callable[[EdgeController], bool],
+        timeout: float | None = None,
+        sim_time_getter=None,
+    ) -> bool:
+        """
+        Run the controller until `predicate(self)` holds.
+
+        The predicate is checked after every logged event; once it holds,
+        the controller stops after the current cycle, as with stop().
+
+        Args:
+            predicate: Called with the controller; True stops the run.
+            timeout: Stop after this many seconds regardless. None = no limit.
+            sim_time_getter: Optional callable returning simulated time.
+
+        Returns:
+            Whether the predicate holds when the run ends (False if the
+            timeout or stop() ended it first).
+        """
+        timer = None
+        if timeout is not None:
+            timer = asyncio.get_running_loop().call_later(timeout, self.stop)
+        self._stop_when = predicate
+        try:
+            await self.run(sim_time_getter=sim_time_getter)
+        finally:
+            self._stop_when = None
+            if timer is not None:
+                timer.cancel()
+        return predicate(self)
 
     def stop(self) -> None:
         """Signal the controller to stop after the current cycle."""
         self._running = False
 
+    def reset(self) -> None:
+        """
+        Return the controller to its just-constructed state for another run.
+
+        Clears the event and sensor logs (keeping their preallocated
+        buffers), the Merkle tree and proofs, and the sensors' counters
+        and noise pools, and unloads the vision model. Intervals,
+        thresholds and sensor scenarios are kept as set.
+
+        Raises:
+            RuntimeError: If the controller is running.
+        """
+        if self._running:
+            raise RuntimeError("Cannot reset a running controller")
+
+        self.chem_sensor.reset()
+        self.optical_sensor.reset()
+        self.turbidity_sensor.reset()
+        self.vision_model.unload()
+
+        self.proof_generator.clear()
+        self.incremental_tree = IncrementalMerkle()
+
+        self._state = PowerState.IDLE
+        self._low_cortisol_streak = 0
+        self._transition_event = asyncio.Event()  # May be bound to a closed loop
+        self._transition_counts.clear()
+        self._last_transmit_time = 0.0
+
+        self._evt_ring[:] = [None] * len(self._evt_ring)
+        self._evt_head = 0
+        self._event_views.clear()
+        self._wall_anchor = time.time()
+        self._mono_anchor_ns = time.monotonic_ns()
+        self._sensor_ring.clear()
+
+    async def wait_for_transition(self, to: PowerState, timeout: float | None = None) -> None:
+        """
+        Wait until the controller is in state `to`.
+
+        Returns immediately if it already is; otherwise wakes on each
+        state change rather than polling.
+
+        Args:
+            to: State to wait for.
+            timeout: Seconds to wait at most. None = wait forever.
+
+        Raises:
+            TimeoutError: If `to` is not reached within `timeout`.
+        """
+        async def _wait() -> None:
+            while self._state != to:
+                self._transition_event.clear()
+                await self._transition_event.wait()
+
+        await asyncio.wait_for(_wait(), timeout)
+
     def get_summary(self) -> dict:
         """Return a summary of the haul for post-surface analysis."""
+        twis = self.twis_history
+        has_twis = twis.size > 0
         return {
-            "total_events": len(self.event_log),
-            "total_sensor_readings": len(self.sensor_log),
-            "twis_readings": len(self.twis_history),
-            "avg_twis": round(sum(self.twis_history) / len(self.twis_history), 4) if self.twis_history else None,
-            "min_twis": round(min(self.twis_history), 4) if self.twis_history else None,
-            "max_twis": round(max(self.twis_history), 4) if self.twis_history else None,
+            "total_events": self._evt_head,
+            "total_sensor_readings": self._sensor_ring.total_appended,
+            "stressed_readings": int(np.count_nonzero(self.stressed_mask())),
+            "twis_readings": int(twis.size),
+            "avg_twis": round(float(twis.mean()), 4) if has_twis else None,
+            "min_twis": round(float(twis.min()), 4) if has_twis else None,
+            "max_twis": round(float(twis.max()), 4) if has_twis else None,
             "proofs_generated": self.proof_generator.proof_count,
         }
@@ -8,6 +8,8 @@ gelatinous (jellyfish/ctenophores) to commercial (fish/shrimp) biomass.
 
 from __future__ import annotations
 
+import numpy as np
+
 
 def calculate_twis(biomass_gelatinous: float, biomass_commercial: float) -> float:
     """
@@ -44,3 +46,28 @@ def calculate_twis(biomass_gelatinous: float, biomass_commercial: float) -> floa
         return 0.0  # Degenerate: no biomass detected
 
     return round(1.0 - (biomass_gelatinous / total), 4)
+
+
+def calculate_twis_batch(
+    biomass_gelatinous: np.ndarray, biomass_commercial: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorised `calculate_twis` over arrays of biomass estimates.
+
+    Same formula and degenerate-case handling as the scalar version;
+    zero total biomass yields 0.0. Rounds with `np.round`, which can
+    differ from the scalar `round` by one unit in the last (4th) decimal
+    on values that sit near a rounding half-way point.
+
+    Raises:
+        ValueError: If any biomass value is negative.
+    """
+    gel = np.asarray(biomass_gelatinous, dtype=np.float64)
+    com = np.asarray(biomass_commercial, dtype=np.float64)
+
+    if (gel < 0).any() or (com < 0).any():
+        raise ValueError("Biomass values must be non-negative.")
+
+    total = gel + com
+    ratio = np.divide(gel, total, out=np.ones_like(total), where=total != 0.0)
+    return np.round(1.0 - ratio, 4)
@@ -0,0 +1,138 @@
+"""
+Sensor Log — Fixed-Capacity Ring Buffer
+
+Stores the edge node's sensor log entries in one preallocated NumPy
+structured array instead of an ever-growing list of dicts, so memory
+stays constant over multi-day deployments. Once full, the oldest rows
+are overwritten — from then on the retained window no longer holds every
+entry the haul's Merkle tree commits to, so a transmitted root can only
+be verified against a log that has not wrapped.
+
+Entries must carry exactly their type's fields, all as floats, and values
+are kept as float64, so the dict view of a row is exactly the entry that was
+recorded — and hashes to the same Merkle leaf.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Fields recorded for each entry type (every entry also has a "type")
+ENTRY_FIELDS: dict[str, tuple[str, ...]] = {
+    "chemical": ("cortisol", "lactate", "timestamp"),
+    "active_cycle": (
+        "timestamp", "cortisol", "lactate", "turbidity_ntu",
+        "biomass_gel", "biomass_com", "stress_score", "confidence",
+        "weight_chemical", "weight_vision", "twis", "vision_inference_ms",
+    ),
+}
+
+_TYPE_CODES = {name: code for code, name in enumerate(ENTRY_FIELDS, start=1)}
+_TYPE_NAMES = {code: name for name, code in _TYPE_CODES.items()}
+_ENTRY_KEYS = {name: frozenset(("type", *fields)) for name, fields in ENTRY_FIELDS.items()}
+
+# Union of all fields; a row leaves the fields its type lacks as NaN
+_COLUMNS = tuple(dict.fromkeys(f for fields in ENTRY_FIELDS.values() for f in fields))
+
+SENSOR_LOG_DTYPE = np.dtype([("type", "u1")] + [(name, "f8") for name in _COLUMNS])
+
+
+class SensorLogRing:
+    """
+    Fixed-capacity, append-only log of sensor entries.
+
+    Rows are written at `head % capacity`; `rows()` returns the retained
+    window in chronological order.
+    """
+
+    def __init__(self, capacity: int = 8192):
+        """
+        Args:
+            capacity: Maximum number of entries retained.
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got {capacity}")
+
+        self._rows = np.zeros(capacity, dtype=SENSOR_LOG_DTYPE)
+        self._capacity = capacity
+        self._head = 0
+
+    def append(self, entry: dict) -> None:
+        """
+        Record one sensor log entry.
+
+        Raises:
+            ValueError: If the entry's type is not in ENTRY_FIELDS, its
+                keys are not exactly that type's fields (a key the row
+                cannot store would be lost, changing the entry's leaf), or
+                a value is not a float (an int or bool would come back as
+                a float, again changing the leaf).
+        """
+        entry_type = entry.get("type")
+        type_code = _TYPE_CODES.get(entry_type)
+        if type_code is None:
+            raise ValueError(f"Unknown sensor log entry type: {entry_type!r}")
+        if entry.keys() != _ENTRY_KEYS[entry_type]:
+            expected = _ENTRY_KEYS[entry_type]
+            raise ValueError(
+                f"{entry_type!r} entry has unexpected keys {sorted(entry.keys() - expected)} "
+                f"and is missing {sorted(expected - entry.keys())}"
+            )
+        not_float = [name for name in ENTRY_FIELDS[entry_type] if not isinstance(entry[name], float)]
+        if not_float:
+            raise ValueError(f"{entry_type!r} entry has non-float values for {not_float}")
+
+        self._rows[self._head % self._capacity] = (
+            type_code,
+            *[entry.get(name, np.nan) for name in _COLUMNS],
+        )
+        self._head += 1
+
+    def rows(self, entry_type: str | None = None) -> np.ndarray:
+        """
+        Retained rows in chronological order.
+
+        Args:
+            entry_type: Only return rows of this type (e.g. "active_cycle").
+
+        Returns:
+            Structured array with SENSOR_LOG_DTYPE. A view when the buffer
+            has not wrapped yet, otherwise a copy.
+        """
+        start = self._head % self._capacity
+        if self._head <= self._capacity:
+            rows = self._rows[:self._head]
+        else:
+            rows = np.concatenate((self._rows[start:], self._rows[:start]))
+
+        if entry_type is not None:
+            rows = rows[rows["type"] == _TYPE_CODES[entry_type]]
+        return rows
+
+    def to_dicts(self) -> list[dict]:
+        """Retained entries as the dicts they were recorded from."""
+        entries = []
+        append = entries.append
+        type_names, entry_fields = _TYPE_NAMES, ENTRY_FIELDS
+        for row in self.rows():
+            name = type_names[int(row["type"])]
+            entry = {"type": name}
+            entry.update((field, float(row[field])) for field in entry_fields[name])
+            append(entry)
+        return entries
+
+    def clear(self) -> None:
+        """Forget all entries, keeping the preallocated rows."""
+        self._head = 0
+
+    def __len__(self) -> int:
+        return min(self._head, self._capacity)
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def total_appended(self) -> int:
+        """Entries recorded since start, including overwritten ones."""
+        return self._head
@@ -4,37 +4,33 @@ Guardian Oracle TAM — Main Entry Point
 Runs the Edge Node controller. When `demo_mode.flag` is present in the
 project root, the system loops simulated sensor data instead of
 attempting to connect to real hardware.
+
+Also serves as a Streamlit app (`streamlit run main.py`). Streamlit
+re-executes this script on every widget event, so the edge node modules
+are imported lazily inside `run()` rather than at module top.
 """
 from __future__ import annotations
 
-import streamlit as st
-
-st.title("Guardian Oracle TAM")
-st.write("System is running in demo mode")
-if st.button("Run Guardian Oracle Demo"):
-    st.write("Running simulation...")
-    main()
-    st.success("Simulation completed. Check terminal logs.")
-
-
 import asyncio
 import logging
 import os
 import sys
+from typing import TYPE_CHECKING
+
+_THIS_DIR = os.path.dirname(__file__)
 
 # Ensure guardian_oracle_tam root is on the path
-sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, _THIS_DIR)
+
+from config import IS_DEMO_MODE
 
-from edge_node.state_machine import EdgeController, PowerState
-from sensors.chemical_sensor import StressScenario
+if TYPE_CHECKING:
+    from edge_node.state_machine import EdgeController
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
-DEMO_FLAG_PATH = os.path.join(os.path.dirname(__file__), "demo_mode.flag")
-IS_DEMO_MODE = os.path.exists(DEMO_FLAG_PATH)
-
 # Timing (real-time for production, accelerated for demo)
 if IS_DEMO_MODE:
     SIM_DURATION_MINUTES = 30
@@ -78,34 +74,43 @@ class _DemoClock:
         return self._start + self.sim_minutes() * 60.0
 
 
-async def _demo_scenario_manager(ctrl: EdgeController, clock: _DemoClock) -> None:
-    """Cycles through stress scenarios during demo mode."""
-    PHASE_1_END, PHASE_2_END = 10, 20
-    current_phase = 0
+PHASE_1_END, PHASE_2_END = 10, 20  # Demo phase boundaries (sim-minutes)
+
+_DEMO_PHASE_TITLES = {
+    1: "Clear water, low stress",
+    2: "Murky water, high stress",
+    3: "Verification & Merkle proof",
+}
 
-    while ctrl._running:
-        sim_min = clock.sim_minutes()
 
-        if sim_min < PHASE_1_END and current_phase != 1:
-            current_phase = 1
-            ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
-            ctrl.turbidity_sensor.base_ntu = 10.0
-            ctrl.optical_sensor.turbidity_factor = 0.1
-            logger.info("DEMO PHASE 1: Clear water, low stress")
+def _enter_demo_phase(ctrl: EdgeController, phase: int) -> None:
+    """Switches stress scenarios for a demo phase (run as a loop callback)."""
+    from sensors.chemical_sensor import StressScenario
 
-        elif PHASE_1_END <= sim_min < PHASE_2_END and current_phase != 2:
-            current_phase = 2
-            ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
-            ctrl.turbidity_sensor.base_ntu = 85.0
-            ctrl.optical_sensor.turbidity_factor = 0.85
-            logger.info("DEMO PHASE 2: Murky water, high stress")
+    if phase == 1:
+        ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
+        ctrl.turbidity_sensor.base_ntu = 10.0
+        ctrl.optical_sensor.turbidity_factor = 0.1
 
-        elif sim_min >= PHASE_2_END and current_phase != 3:
-            current_phase = 3
-            ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
-            logger.info("DEMO PHASE 3: Verification & Merkle proof")
+    elif phase == 2:
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+        ctrl.turbidity_sensor.base_ntu = 85.0
+        ctrl.optical_sensor.turbidity_factor = 0.85
 
-        await asyncio.sleep(REAL_SECONDS_PER_SIM_MINUTE * 0.5 if IS_DEMO_MODE else 5.0)
+    elif phase == 3:
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+
+    logger.info("DEMO PHASE %d: %s", phase, _DEMO_PHASE_TITLES[phase])
+
+
+def _schedule_demo_phases(ctrl: EdgeController) -> list[asyncio.TimerHandle]:
+    """Enters phase 1 now and schedules the later phases at their boundaries."""
+    loop = asyncio.get_running_loop()
+    _enter_demo_phase(ctrl, 1)
+    return [
+        loop.call_later(PHASE_1_END * REAL_SECONDS_PER_SIM_MINUTE, _enter_demo_phase, ctrl, 2),
+        loop.call_later(PHASE_2_END * REAL_SECONDS_PER_SIM_MINUTE, _enter_demo_phase, ctrl, 3),
+    ]
 
 # ---------------------------------------------------------------------------
 # Main
@@ -113,7 +118,19 @@ async def _demo_scenario_manager(ctrl: EdgeController, clock: _DemoClock) -> Non
 
 async def run() -> None:
     mode_label = "DEMO" if IS_DEMO_MODE else "PRODUCTION"
-    logger.info(f"Guardian Oracle TAM v1.0 starting in {mode_label} mode")
+    logger.info("Guardian Oracle TAM v1.0 starting in %s mode", mode_label)
+
+    from edge_node.state_machine import EdgeController
+
+    if IS_DEMO_MODE:
+        from sensors.chemical_sensor import ChemicalSensor
+        from sensors.optical_sensor import OpticalSensor
+        from sensors.turbidity_sensor import TurbiditySensor
+
+        # Simulated acquisition delays only stretch the accelerated run; just yield
+        ChemicalSensor.ADC_DELAY_S = 0.0
+        OpticalSensor.ADC_DELAY_S = 0.0
+        TurbiditySensor.ADC_DELAY_S = 0.0
 
     ctrl = EdgeController(
         idle_poll_interval=IDLE_POLL,
@@ -126,26 +143,19 @@ async def run() -> None:
         clock = _DemoClock(REAL_SECONDS_PER_SIM_MINUTE)
         real_duration = SIM_DURATION_MINUTES * REAL_SECONDS_PER_SIM_MINUTE
 
-        controller_task = asyncio.create_task(
-            ctrl.run(duration=real_duration, sim_time_getter=clock.sim_time)
-        )
-        scenario_task = asyncio.create_task(
-            _demo_scenario_manager(ctrl, clock)
-        )
-
-        await controller_task
-        ctrl.stop()
-        scenario_task.cancel()
+        phase_timers = _schedule_demo_phases(ctrl)
         try:
-            await scenario_task
-        except asyncio.CancelledError:
-            pass
+            await ctrl.run(duration=real_duration, sim_time_getter=clock.sim_time)
+        finally:
+            ctrl.stop()
+            for timer in phase_timers:
+                timer.cancel()
 
         # Print summary
         summary = ctrl.get_summary()
         logger.info("=== DEMO RUN COMPLETE ===")
         for k, v in summary.items():
-            logger.info(f"  {k}: {v}")
+            logger.info("  %s: %s", k, v)
     else:
         # Production: run indefinitely until interrupted
         logger.info("Waiting for sensor events... (Ctrl+C to stop)")
@@ -156,16 +166,54 @@ async def run() -> None:
             logger.info("Shutdown requested. Dumping local logs...")
             summary = ctrl.get_summary()
             for k, v in summary.items():
-                logger.info(f"  {k}: {v}")
+                logger.info("  %s: %s", k, v)
+
+
+def _use_uvloop() -> None:
+    """Run asyncio on uvloop when it is installed (optional dependency)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 
 def main():
+    _use_uvloop()
     try:
         asyncio.run(run())
     except KeyboardInterrupt:
         logger.info("Guardian Oracle TAM shutdown.")
 
 
-#if __name__ == "__main__":
- #   main()
- 
+# ---------------------------------------------------------------------------
+# Streamlit UI
+# ---------------------------------------------------------------------------
+
+def ui() -> None:
+    """Streamlit front end: runs the demo simulation on button press."""
+    import streamlit as st
+
+    st.title("Guardian Oracle TAM")
+    st.write("System is running in demo mode")
+    if st.button("Run Guardian Oracle Demo"):
+        st.write("Running simulation...")
+        main()
+        st.success("Simulation completed. Check terminal logs.")
+
+
+def _in_streamlit() -> bool:
+    """True when executed by `streamlit run` rather than plain `python`."""
+    try:
+        from streamlit import runtime
+    except ImportError:
+        return False
+    return runtime.exists()
+
+
+if __name__ == "__main__":
+    if _in_streamlit():
+        ui()
+    else:
+        main()
+
@@ -8,18 +8,21 @@ In production, frames would be fed to the Vision AI model on the Jetson GPU.
 from __future__ import annotations
 
 import asyncio
-import random
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
+import numpy as np
 
-@dataclass
+from sensors.sample_buffer import SampleBuffer
+
+
+@dataclass(slots=True)
 class OpticalReading:
     """A single capture from the optical sensor (camera frame analysis)."""
     frame_id: int
     biomass_gelatinous: float    # kg estimate — jellyfish/ctenophores
     biomass_commercial: float    # kg estimate — fish/shrimp
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float
     quality_score: float = 1.0   # 0.0–1.0, degrades with turbidity
     sensor_id: str = "OPT-01"
 
@@ -40,14 +43,23 @@ class OpticalSensor:
     In real hardware, this would interface with a CSI/USB camera module.
     """
 
-    def __init__(self, turbidity_factor: float = 0.0):
+    ADC_DELAY_S = 0.005  # Simulated capture delay (accelerated); 0 just yields
+
+    def __init__(self, turbidity_factor: float = 0.0, seed: int | None = None):
         """
         Args:
             turbidity_factor: 0.0 (crystal clear) to 1.0 (fully opaque).
                 Used to degrade quality_score of readings.
+            seed: Seed for this sensor's noise generator (None for a
+                fresh, unpredictable stream).
         """
         self._frame_counter = 0
         self._turbidity_factor = turbidity_factor
+        # Standard normals; means and noise scale vary per capture
+        self._samples = SampleBuffer(
+            loc=(0.0, 0.0), scale=(1.0, 1.0), floor=None,
+            rng=np.random.default_rng(seed),
+        )
 
     @property
     def turbidity_factor(self) -> float:
@@ -55,36 +67,53 @@ class OpticalSensor:
 
     @turbidity_factor.setter
     def turbidity_factor(self, value: float) -> None:
-        self._turbidity_factor = max(0.0, min(1.0, value))
+        # Plain comparisons: set every ACTIVE cycle, usually already in range
+        if value != value:  # NaN fails both checks below
+            value = 0.0
+        elif value < 0.0:
+            value = 0.0
+        elif value > 1.0:
+            value = 1.0
+        self._turbidity_factor = value
 
     async def capture(
         self,
         gelatinous_mean: float = 5.0,
         commercial_mean: float = 45.0,
+        now: float | None = None,
     ) -> OpticalReading:
         """
         Capture a frame and return biomass estimates.
         
         Simulates ~50ms frame capture + basic pre-processing.
         Quality degrades with turbidity.
+
+        Args:
+            gelatinous_mean: Mean gelatinous biomass (kg) in view.
+            commercial_mean: Mean commercial biomass (kg) in view.
+            now: Timestamp to stamp the frame with (e.g. simulated
+                time). Defaults to the wall clock.
         """
-        await asyncio.sleep(0.005)  # Simulated capture delay (accelerated)
+        await asyncio.sleep(self.ADC_DELAY_S)
 
         self._frame_counter += 1
         quality = max(0.05, 1.0 - self._turbidity_factor)
 
         # Add noise — more noise when turbidity is high
         noise_scale = 1.0 + (self._turbidity_factor * 4.0)
-        gel = max(0.0, random.gauss(gelatinous_mean, 2.0 * noise_scale))
-        com = max(0.0, random.gauss(commercial_mean, 5.0 * noise_scale))
+        z_gel, z_com = await self._samples.next_async()
+        gel = max(0.0, gelatinous_mean + z_gel * 2.0 * noise_scale)
+        com = max(0.0, commercial_mean + z_com * 5.0 * noise_scale)
 
         return OpticalReading(
             frame_id=self._frame_counter,
             biomass_gelatinous=round(gel, 2),
             biomass_commercial=round(com, 2),
+            timestamp=time.time() if now is None else now,
             quality_score=round(quality, 3),
         )
 
     def reset(self) -> None:
-        """Reset frame counter."""
+        """Reset frame counter and drop the pooled noise."""
         self._frame_counter = 0
+        self._samples.discard()
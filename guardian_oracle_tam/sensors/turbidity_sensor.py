@@ -8,26 +8,28 @@ This reading drives the sensor fusion confidence-weighting decision.
 from __future__ import annotations
 
 import asyncio
-import random
 import time
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from sensors.sample_buffer import SampleBuffer
+
 
 # --- Threshold ---
 TURBIDITY_THRESHOLD = 50.0  # NTU — above this, trust chemical over vision
 
 
-@dataclass
+@dataclass(slots=True)
 class TurbidityReading:
     """A single turbidity measurement."""
     ntu: float                   # Nephelometric Turbidity Units
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float
     sensor_id: str = "TURB-01"
+    is_murky: bool = field(init=False, compare=False)  # Above fusion threshold
 
-    @property
-    def is_murky(self) -> bool:
-        """Returns True if turbidity exceeds the fusion threshold."""
-        return self.ntu > TURBIDITY_THRESHOLD
+    def __post_init__(self) -> None:
+        self.is_murky = self.ntu > TURBIDITY_THRESHOLD
 
     def __repr__(self) -> str:
         clarity = "MURKY" if self.is_murky else "CLEAR"
@@ -42,38 +44,61 @@ class TurbiditySensor:
     (e.g., a DFRobot SEN0189 or similar submersible probe).
     """
 
-    def __init__(self, base_ntu: float = 10.0):
+    ADC_DELAY_S = 0.002  # Simulated measurement delay (accelerated); 0 just yields
+
+    def __init__(self, base_ntu: float = 10.0, seed: int | None = None):
         """
         Args:
             base_ntu: Baseline turbidity level for simulation. Can be
                 changed dynamically to simulate environmental shifts.
+            seed: Seed for this sensor's noise generator (None for a
+                fresh, unpredictable stream).
         """
+        # Each pool gets its own child stream, so a background refill of a
+        # discarded pool never shares a generator with its replacement
+        self._seeds = np.random.SeedSequence(seed)
         self._base_ntu = base_ntu
+        self._samples = self._make_samples(base_ntu)
         self._read_count = 0
 
+    def _make_samples(self, base_ntu: float) -> SampleBuffer:
+        """Noise pool of NTU values around the baseline (10% spread)."""
+        return SampleBuffer(
+            loc=(base_ntu,),
+            scale=(base_ntu * 0.1,),
+            decimals=1,
+            rng=np.random.default_rng(self._seeds.spawn(1)[0]),
+        )
+
     @property
     def base_ntu(self) -> float:
         return self._base_ntu
 
     @base_ntu.setter
     def base_ntu(self, value: float) -> None:
-        self._base_ntu = max(0.0, value)
+        self._base_ntu = value if value > 0.0 else 0.0
+        self._samples = self._make_samples(self._base_ntu)
 
-    async def read(self) -> TurbidityReading:
+    async def read(self, now: float | None = None) -> TurbidityReading:
         """
         Perform an asynchronous turbidity measurement.
         Simulates ~20ms optical scatter measurement.
+
+        Args:
+            now: Timestamp to stamp the reading with (e.g. simulated
+                time). Defaults to the wall clock.
         """
-        await asyncio.sleep(0.002)  # Simulated measurement delay (accelerated)
+        await asyncio.sleep(self.ADC_DELAY_S)
 
-        ntu = max(0.0, random.gauss(self._base_ntu, self._base_ntu * 0.1))
+        (ntu,) = await self._samples.next_async()
         self._read_count += 1
 
-        return TurbidityReading(ntu=round(ntu, 1))
+        return TurbidityReading(ntu=ntu, timestamp=time.time() if now is None else now)
 
     def reset(self) -> None:
-        """Reset read counter."""
+        """Reset read counter and drop the pooled noise."""
         self._read_count = 0
+        self._samples.discard()
 
     @property
     def read_count(self) -> int:
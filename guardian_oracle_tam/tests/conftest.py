@@ -0,0 +1,38 @@
+"""
+Shared pytest configuration.
+
+Puts the project root on sys.path once for every test module. Async
+tests run on uvloop when it is installed, and on the default
+asyncio loop otherwise. On Python 3.12+ the loop also gets asyncio's
+eager task factory, so `create_task(ctrl.run(...))` starts running the
+controller immediately instead of on the next loop iteration.
+"""
+
+import asyncio
+import pathlib
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+try:
+    import uvloop
+except ImportError:  # Optional: the default loop is used instead
+    uvloop = None
+
+_EAGER_TASK_FACTORY = getattr(asyncio, "eager_task_factory", None)  # Python 3.12+
+
+
+def new_test_loop() -> asyncio.AbstractEventLoop:
+    """Event loop for one async test: uvloop if available, eager tasks on 3.12+."""
+    loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+    if _EAGER_TASK_FACTORY is not None:
+        loop.set_task_factory(_EAGER_TASK_FACTORY)
+    return loop
+
+
+def pytest_asyncio_loop_factories(config, item):
+    """Create every test's event loop with `new_test_loop`."""
+    return {"uvloop" if uvloop is not None else "asyncio": new_test_loop}
@@ -17,6 +17,8 @@ import asyncio
 import time
 import logging
 
+import numpy as np
+
 # Force UTF-8 stdout for Windows compatibility
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding="utf-8", errors="replace")
@@ -25,7 +27,7 @@ if sys.platform == "win32":
 # Add project root to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from edge_node.state_machine import EdgeController, PowerState
+from edge_node.state_machine import EdgeController, EventKind, PowerState
 from sensors.chemical_sensor import StressScenario
 
 # --- Configuration ---
@@ -66,72 +68,58 @@ class SimulationClock:
         return self._start_real + self.sim_seconds()
 
 
-async def scenario_manager(ctrl: EdgeController, clock: SimulationClock) -> None:
+_BANNER_BAR = "==========================================================="
+
+# Phase -> (title, expected behaviour), logged as one banner record
+_PHASE_BANNERS = {
+    1: ("PHASE 1 (Min 0-10): CLEAR WATER, LOW STRESS",
+        "Expected: Vision active, TWIS > 0.7"),
+    2: ("PHASE 2 (Min 11-20): MURKY WATER, HIGH STRESS",
+        "Expected: Chemical weight rises, Vision degrades, Reflex triggered"),
+    3: ("PHASE 3 (Min 21-30): VERIFICATION",
+        "Expected: Merkle hash generated, acoustic send logged"),
+}
+
+
+def enter_phase(ctrl: EdgeController, phase: int) -> None:
     """
-    Dynamically adjusts sensor scenarios based on the current
-    simulation phase. Runs concurrently with the edge controller.
+    Switches sensor scenarios for a simulation phase. Scheduled as a
+    one-shot loop callback at each phase boundary.
     """
-    current_phase = 0
-
-    while ctrl._running:
-        sim_min = clock.sim_minutes()
-
-        if sim_min < PHASE_1_END and current_phase != 1:
-            # Phase 1: Clear water, low stress
-            current_phase = 1
-            ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
-            ctrl.turbidity_sensor.base_ntu = 10.0
-            ctrl.optical_sensor.turbidity_factor = 0.1
-            logger.info(
-                "==========================================================="
-            )
-            logger.info(
-                "  PHASE 1 (Min 0-10): CLEAR WATER, LOW STRESS"
-            )
-            logger.info(
-                "  Expected: Vision active, TWIS > 0.7"
-            )
-            logger.info(
-                "==========================================================="
-            )
-
-        elif PHASE_1_END <= sim_min < PHASE_2_END and current_phase != 2:
-            # Phase 2: Murky water, high cortisol
-            current_phase = 2
-            ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
-            ctrl.turbidity_sensor.base_ntu = 85.0
-            ctrl.optical_sensor.turbidity_factor = 0.85
-            logger.info(
-                "==========================================================="
-            )
-            logger.info(
-                "  PHASE 2 (Min 11-20): MURKY WATER, HIGH STRESS"
-            )
-            logger.info(
-                "  Expected: Chemical weight rises, Vision degrades, Reflex triggered"
-            )
-            logger.info(
-                "==========================================================="
-            )
-
-        elif sim_min >= PHASE_2_END and current_phase != 3:
-            # Phase 3: Verification period
-            current_phase = 3
-            ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
-            logger.info(
-                "==========================================================="
-            )
-            logger.info(
-                "  PHASE 3 (Min 21-30): VERIFICATION"
-            )
-            logger.info(
-                "  Expected: Merkle hash generated, acoustic send logged"
-            )
-            logger.info(
-                "==========================================================="
-            )
-
-        await asyncio.sleep(REAL_SECONDS_PER_SIM_MINUTE * 0.5)
+    if phase == 1:
+        # Phase 1: Clear water, low stress
+        ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
+        ctrl.turbidity_sensor.base_ntu = 10.0
+        ctrl.optical_sensor.turbidity_factor = 0.1
+
+    elif phase == 2:
+        # Phase 2: Murky water, high cortisol
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+        ctrl.turbidity_sensor.base_ntu = 85.0
+        ctrl.optical_sensor.turbidity_factor = 0.85
+
+    elif phase == 3:
+        # Phase 3: Verification period
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+
+    title, expected = _PHASE_BANNERS[phase]
+    logger.info("%s\n  %s\n  %s\n%s", _BANNER_BAR, title, expected, _BANNER_BAR)
+
+
+def schedule_phases(ctrl: EdgeController) -> list[asyncio.TimerHandle]:
+    """
+    Enters phase 1 now and schedules the later phases at their
+    boundaries, instead of polling the clock.
+
+    Returns:
+        Timer handles, to cancel if the run ends early.
+    """
+    loop = asyncio.get_running_loop()
+    enter_phase(ctrl, 1)
+    return [
+        loop.call_later(PHASE_1_END * REAL_SECONDS_PER_SIM_MINUTE, enter_phase, ctrl, 2),
+        loop.call_later(PHASE_2_END * REAL_SECONDS_PER_SIM_MINUTE, enter_phase, ctrl, 3),
+    ]
 
 
 def validate_results(ctrl: EdgeController, clock: SimulationClock) -> bool:
@@ -157,22 +145,26 @@ def validate_results(ctrl: EdgeController, clock: SimulationClock) -> bool:
         print(f"  [*] Max TWIS:                {summary['max_twis']:.4f}")
     print(f"  [*] Merkle Proofs Generated:  {summary['proofs_generated']}")
 
+    active_transitions = sum(
+        count for (src, dst), count in ctrl.transition_counts.items()
+        if PowerState.ACTIVE in (src, dst)
+    )
+    merkle_records = [e.data for e in ctrl.event_log if e.kind is EventKind.MERKLE_HASH_SENT]
+
     # --- Assertion 1: State transitions occurred ---
     print("\n  --- Assertion 1: State Transitions ---")
-    transitions = [e for e in ctrl.event_log if "TRANSITION" in e.event]
-    active_entries = [e for e in transitions if "ACTIVE" in e.event]
-
-    if len(active_entries) > 0:
-        print(f"  [PASS] {len(active_entries)} state transition(s) involving ACTIVE detected")
+    if active_transitions > 0:
+        print(f"  [PASS] {active_transitions} state transition(s) involving ACTIVE detected")
     else:
         print("  [FAIL] No ACTIVE state transitions detected")
         all_passed = False
 
     # --- Assertion 2: TWIS was calculated ---
     print("\n  --- Assertion 2: TWIS Calculation ---")
-    if len(ctrl.twis_history) > 0:
-        print(f"  [PASS] {len(ctrl.twis_history)} TWIS score(s) calculated")
-        in_range = all(0.0 <= t <= 1.0 for t in ctrl.twis_history)
+    twis = ctrl.twis_history
+    if twis.size > 0:
+        print(f"  [PASS] {twis.size} TWIS score(s) calculated")
+        in_range = bool(np.all((twis >= 0.0) & (twis <= 1.0)))
         if in_range:
             print("  [PASS] All TWIS scores in valid range [0.0, 1.0]")
         else:
@@ -184,43 +176,30 @@ def validate_results(ctrl: EdgeController, clock: SimulationClock) -> bool:
 
     # --- Assertion 3: Sensor fusion weights shifted ---
     print("\n  --- Assertion 3: Sensor Fusion Weights ---")
-    active_cycles = [
-        e for e in ctrl.sensor_log
-        if e.get("type") == "active_cycle"
-    ]
-    if active_cycles:
-        high_chem_weight = [
-            e for e in active_cycles
-            if e.get("weight_chemical", 0) > 0.6
-        ]
-        low_chem_weight = [
-            e for e in active_cycles
-            if e.get("weight_chemical", 1) < 0.4
-        ]
+    w_chem = ctrl.sensor_rows("active_cycle")["weight_chemical"]
+    if len(w_chem):
+        high_chem_weight = np.count_nonzero(w_chem > 0.6)
+        low_chem_weight = np.count_nonzero(w_chem < 0.4)
 
         if high_chem_weight:
-            print(f"  [PASS] {len(high_chem_weight)} reading(s) with high chemical weight "
+            print(f"  [PASS] {high_chem_weight} reading(s) with high chemical weight "
                   f"(>0.6) -- murky water correctly weighted")
         else:
             print("  [WARN] No readings with high chemical weight found")
 
         if low_chem_weight:
-            print(f"  [PASS] {len(low_chem_weight)} reading(s) with low chemical weight "
+            print(f"  [PASS] {low_chem_weight} reading(s) with low chemical weight "
                   f"(<0.4) -- clear water correctly weighted")
     else:
         print("  [WARN] No active cycle data to validate fusion weights")
 
     # --- Assertion 4: Merkle proofs generated ---
     print("\n  --- Assertion 4: Merkle Proof Generation ---")
-    merkle_events = [
-        e for e in ctrl.event_log
-        if "MERKLE_HASH_SENT" in e.event
-    ]
-    if len(merkle_events) > 0:
-        for me in merkle_events:
-            root = me.data.get("merkle_root", "?")
-            leaves = me.data.get("leaf_count", "?")
-            tx_bytes = me.data.get("transmission_bytes", "?")
+    if merkle_records:
+        for data in merkle_records:
+            root = data.get("merkle_root", "?")
+            leaves = data.get("leaf_count", "?")
+            tx_bytes = data.get("transmission_bytes", "?")
             print(f"  [PASS] Merkle root = {root[:32]}...")
             print(f"           Leaves: {leaves} | TX: {tx_bytes} bytes")
     else:
@@ -269,31 +248,31 @@ async def run_simulation() -> bool:
     # Total real duration
     real_duration = SIM_DURATION_MINUTES * REAL_SECONDS_PER_SIM_MINUTE
 
-    # Run controller and scenario manager concurrently
-    controller_task = asyncio.create_task(
-        ctrl.run(duration=real_duration, sim_time_getter=clock.sim_time)
-    )
-    scenario_task = asyncio.create_task(
-        scenario_manager(ctrl, clock)
-    )
-
-    # Wait for the controller to finish
-    await controller_task
-    ctrl.stop()
-
-    # Cancel the scenario manager
-    scenario_task.cancel()
+    # Schedule the phase switches, then run the controller
+    phase_timers = schedule_phases(ctrl)
     try:
-        await scenario_task
-    except asyncio.CancelledError:
-        pass
+        await ctrl.run(duration=real_duration, sim_time_getter=clock.sim_time)
+    finally:
+        ctrl.stop()
+        for timer in phase_timers:
+            timer.cancel()
 
     # Validate and report
     return validate_results(ctrl, clock)
 
 
+def _use_uvloop() -> None:
+    """Run asyncio on uvloop when it is installed (optional dependency)."""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
 def main():
     """Entry point for the simulation script."""
+    _use_uvloop()
     success = asyncio.run(run_simulation())
     sys.exit(0 if success else 1)
 
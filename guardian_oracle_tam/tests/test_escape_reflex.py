@@ -5,122 +5,219 @@ Tests that the edge node correctly transitions between IDLE and ACTIVE
 states based on cortisol levels (the "escape reflex" trigger).
 """
 
-import sys
-import os
 import asyncio
+import itertools
 
-# Add project root to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
-from edge_node.state_machine import EdgeController, PowerState
+from edge_node.state_machine import EdgeController, EventKind, PowerState
 from sensors.chemical_sensor import CORTISOL_LIMIT, StressScenario
 import pytest
 
 
+def _make_controller(**kwargs) -> EdgeController:
+    """Create a controller that polls back-to-back for testing."""
+    defaults = {
+        "idle_poll_interval": 0,  # Yield only: asyncio.sleep(0) sets no timer
+        "active_poll_interval": 0,
+        "transmit_interval": 9999,  # Disable auto-transmit
+        "idle_return_threshold": 3,
+    }
+    defaults.update(kwargs)
+    return EdgeController(**defaults)
+
+
+@pytest.fixture(scope="module")
+def shared_controller() -> EdgeController:
+    """One fast-polling controller for the module; its buffers are reused."""
+    return _make_controller()
+
+
+@pytest.fixture
+def ctrl(shared_controller) -> EdgeController:
+    """The shared controller, reset to its just-constructed state."""
+    shared_controller.reset()
+    return shared_controller
+
+
 class TestEscapeReflex:
     """Tests for cortisol-triggered state transitions."""
 
-    def _make_controller(self, **kwargs) -> EdgeController:
-        """Create a controller with fast polling for testing."""
-        defaults = {
-            "idle_poll_interval": 0.01,
-            "active_poll_interval": 0.01,
-            "transmit_interval": 9999,  # Disable auto-transmit
-            "idle_return_threshold": 3,
-        }
-        defaults.update(kwargs)
-        return EdgeController(**defaults)
-
     def test_initial_state_is_idle(self):
         """Controller should start in IDLE state."""
-        ctrl = self._make_controller()
+        ctrl = _make_controller()
         assert ctrl.state == PowerState.IDLE
 
     @pytest.mark.asyncio
-    async def test_high_cortisol_triggers_active(self):
-        """High cortisol should transition from IDLE → ACTIVE."""
-        ctrl = self._make_controller()
+    @pytest.mark.parametrize("scenario, expect_active, timeout", [
+        # High stress → cortisol > CORTISOL_LIMIT: wakes up promptly
+        pytest.param(StressScenario.MURKY_HIGH_STRESS, True, 1.0, id="high_cortisol_triggers_active"),
+        # Low stress → cortisol < CORTISOL_LIMIT: must stay IDLE for the whole window
+        pytest.param(StressScenario.CLEAR_LOW_STRESS, False, 0.1, id="low_cortisol_stays_idle"),
+    ])
+    async def test_cortisol_transition(self, ctrl, scenario, expect_active, timeout):
+        """Cortisol above the limit moves IDLE → ACTIVE; below it, IDLE is kept."""
+        ctrl.chem_sensor.scenario = scenario
+
+        reached = await ctrl.run_until(lambda c: c.state == PowerState.ACTIVE, timeout=timeout)
+
+        assert reached is expect_active
+        woke = ctrl.transition_counts.get((PowerState.IDLE, PowerState.ACTIVE), 0) > 0
+        assert woke is expect_active, (
+            "Should have transitioned to ACTIVE on high cortisol" if expect_active
+            else "Should NOT transition to ACTIVE on low cortisol"
+        )
 
-        # Set scenario to high stress → cortisol > CORTISOL_LIMIT
+    @pytest.mark.asyncio
+    async def test_active_returns_to_idle_on_low_cortisol_streak(self):
+        """
+        Controller should return to IDLE after `idle_return_threshold`
+        consecutive low-cortisol readings while in ACTIVE.
+        """
+        ctrl = _make_controller(idle_return_threshold=2)
+
+        # Start with high stress to enter ACTIVE
         ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
 
-        # Run for a short duration — should transition to ACTIVE
-        task = asyncio.create_task(ctrl.run(duration=1.0))
-        await asyncio.sleep(0.2)  # Allow time for at least one poll cycle
+        task = asyncio.create_task(ctrl.run(duration=2.0))
+        await ctrl.wait_for_transition(PowerState.ACTIVE, timeout=1.0)
+
+        # Now switch to low stress — should return to IDLE
+        ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
+        await ctrl.wait_for_transition(PowerState.IDLE, timeout=1.0)
         ctrl.stop()
         await task
 
-        # Should have transitioned away from IDLE
-        transitions = [
-            e for e in ctrl.event_log
-            if "TRANSITION" in e.event and "ACTIVE" in e.event
-        ]
-        assert len(transitions) > 0, "Should have transitioned to ACTIVE on high cortisol"
+        # Check that IDLE→ACTIVE was followed by ACTIVE→IDLE
+        transitions = ctrl.transitions
+        assert (PowerState.IDLE, PowerState.ACTIVE) in transitions, "Should have entered ACTIVE state"
+        assert (PowerState.ACTIVE, PowerState.IDLE) in transitions, "Should have returned to IDLE state"
+        assert transitions.index((PowerState.IDLE, PowerState.ACTIVE)) < \
+            transitions.index((PowerState.ACTIVE, PowerState.IDLE))
 
     @pytest.mark.asyncio
-    async def test_low_cortisol_stays_idle(self):
-        """Low cortisol should keep the controller in IDLE."""
-        ctrl = self._make_controller()
+    async def test_twis_calculated_in_active_state(self, ctrl):
+        """TWIS history should be populated when in ACTIVE state."""
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
 
-        # Set scenario to low stress → cortisol < CORTISOL_LIMIT
-        ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
+        await ctrl.run_until(lambda c: len(c.twis_history) >= 5, timeout=1.0)
 
-        task = asyncio.create_task(ctrl.run(duration=0.5))
-        await asyncio.sleep(0.3)
-        ctrl.stop()
-        await task
+        twis = ctrl.twis_history
+        assert twis.size > 0, "TWIS should be calculated during ACTIVE state"
+        assert any(e.kind is EventKind.GPU_WAKE for e in ctrl.event_log), "GPU should wake in ACTIVE"
+        in_range = (twis >= 0.0) & (twis <= 1.0)
+        assert in_range.all(), f"TWIS out of valid range: {twis[~in_range]}"
+
+    @pytest.mark.asyncio
+    async def test_active_rows_stamped_with_their_readings(self, ctrl, monkeypatch):
+        """Each ACTIVE row carries the timestamp of the reading it logs."""
+        read = ctrl.chem_sensor.read
+        cortisol_at: dict[float, float] = {}
+
+        async def recording_read(now=None):
+            reading = await read(now)
+            cortisol_at[reading.timestamp] = reading.cortisol_ng_ml
+            return reading
+
+        monkeypatch.setattr(ctrl.chem_sensor, "read", recording_read)
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+        clock = itertools.count()  # Every cycle sees a distinct time
+
+        await ctrl.run_until(
+            lambda c: len(c.twis_history) >= 3, timeout=1.0,
+            sim_time_getter=lambda: float(next(clock)),
+        )
 
-        # Should NOT have any ACTIVE transitions
-        active_transitions = [
-            e for e in ctrl.event_log
-            if "TRANSITION" in e.event and "ACTIVE" in e.event
-        ]
-        assert len(active_transitions) == 0, "Should NOT transition to ACTIVE on low cortisol"
+        rows = ctrl.sensor_rows("active_cycle")
+        assert len(rows) >= 3
+        for row in rows:
+            assert cortisol_at[row["timestamp"]] == row["cortisol"]
 
     @pytest.mark.asyncio
-    async def test_active_returns_to_idle_on_low_cortisol_streak(self):
-        """
-        Controller should return to IDLE after `idle_return_threshold`
-        consecutive low-cortisol readings while in ACTIVE.
-        """
-        ctrl = self._make_controller(idle_return_threshold=2)
+    async def test_integer_sim_clock(self, ctrl):
+        """An int-returning sim clock is logged as float, not rejected."""
+        ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
 
-        # Start with high stress to enter ACTIVE
+        reached = await ctrl.run_until(
+            lambda c: len(c.twis_history) >= 3, timeout=1.0,
+            sim_time_getter=itertools.count().__next__,
+        )
+
+        assert reached
+        assert all(isinstance(row["timestamp"], float) for row in ctrl.sensor_rows())
+
+    @pytest.mark.asyncio
+    async def test_prefetched_reads_dropped_on_exit(self, ctrl, monkeypatch):
+        """Leaving ACTIVE cancels the reads started for the next cycle."""
+        read = ctrl.chem_sensor.read
+
+        async def stalling_read(now=None):
+            if len(ctrl.twis_history) >= 2:  # Prefetch for the fourth cycle hangs
+                await asyncio.Event().wait()
+            return await read(now)
+
+        monkeypatch.setattr(ctrl.chem_sensor, "read", stalling_read)
         ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
 
-        task = asyncio.create_task(ctrl.run(duration=2.0))
-        await asyncio.sleep(0.2)
+        await ctrl.run_until(lambda c: len(c.twis_history) >= 3, timeout=1.0)
 
-        # Now switch to low stress — should eventually return to IDLE
-        ctrl.chem_sensor.scenario = StressScenario.CLEAR_LOW_STRESS
-        await asyncio.sleep(0.5)
-        ctrl.stop()
-        await task
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    def test_event_views_refresh_on_record(self, ctrl):
+        """event_log / transitions are reused until the next event."""
+        log = ctrl.event_log
+        assert ctrl.event_log is log
+        assert ctrl.transitions == []
 
-        # Check that we had both IDLE→ACTIVE and ACTIVE→IDLE transitions
-        events = [e.event for e in ctrl.event_log if "TRANSITION" in e.event]
-        has_to_active = any("ACTIVE" in e for e in events)
-        has_to_idle = any("IDLE" in e and "ACTIVE" in e for e in events)
+        ctrl._transition(PowerState.ACTIVE, "test")
 
-        assert has_to_active, "Should have entered ACTIVE state"
-        # The return to IDLE may or may not happen depending on timing,
-        # but we verify the mechanism exists through the log
+        assert len(ctrl.event_log) == len(log) + 1
+        assert ctrl.transitions == [(PowerState.IDLE, PowerState.ACTIVE)]
 
     @pytest.mark.asyncio
-    async def test_twis_calculated_in_active_state(self):
-        """TWIS history should be populated when in ACTIVE state."""
-        ctrl = self._make_controller()
+    async def test_stressed_mask_matches_log(self, ctrl):
+        """The vectorised stress mask should agree with per-entry checks."""
+        ctrl.chem_sensor.scenario = StressScenario.TRANSITION
+
+        await ctrl.run_until(lambda c: len(c.sensor_rows()) >= 20, timeout=1.0)
+
+        expected = [e["cortisol"] > CORTISOL_LIMIT for e in ctrl.sensor_log]
+        assert ctrl.stressed_mask().tolist() == expected
+        assert ctrl.get_summary()["stressed_readings"] == sum(expected)
+
+
+class TestReset:
+    """Tests for reusing one controller across runs."""
+
+    @pytest.mark.asyncio
+    async def test_reset_clears_previous_run(self, ctrl):
+        """After reset the controller looks freshly constructed."""
         ctrl.chem_sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+        await ctrl.run_until(lambda c: c.state == PowerState.ACTIVE, timeout=1.0)
+        assert ctrl.transitions and ctrl.event_log
+
+        ctrl.reset()
+        assert ctrl.state == PowerState.IDLE
+        assert ctrl.event_log == []
+        assert ctrl.transitions == []
+        assert ctrl.sensor_log == []
+        assert ctrl.incremental_tree.leaf_count == 0
+        assert ctrl.transition_counts == {}
+        assert not ctrl.vision_model.is_loaded
+        assert ctrl.get_summary()["total_sensor_readings"] == 0
+
+    def test_reset_keeps_proof_generator(self, ctrl):
+        """reset clears the proof generator in place, keeping its settings."""
+        gen = ctrl.proof_generator
+        gen.build_and_send([{"type": "chemical", "cortisol": 1.0, "lactate": 1.0, "timestamp": 0.0}])
+        ctrl.reset()
+        assert ctrl.proof_generator is gen
+        assert gen.proof_count == 0
 
+    @pytest.mark.asyncio
+    async def test_reset_refuses_while_running(self, ctrl):
+        """A running controller cannot be reset."""
         task = asyncio.create_task(ctrl.run(duration=1.0))
-        await asyncio.sleep(0.5)
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            ctrl.reset()
         ctrl.stop()
         await task
-
-        assert len(ctrl.twis_history) > 0, "TWIS should be calculated during ACTIVE state"
-        for twis in ctrl.twis_history:
-            assert 0.0 <= twis <= 1.0, f"TWIS {twis} out of valid range"
-
-
-if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
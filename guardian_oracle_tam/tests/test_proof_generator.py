@@ -0,0 +1,150 @@
+"""
+Unit Tests — Merkle Proof Generation
+
+Tests that the incremental Merkle tree maintained during a haul commits
+to the same root as a full rebuild from the dumped sensor log.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from blockchain.proof_generator import IncrementalMerkle, MerkleTree, ProofGenerator, hash_leaf, pack_entry
+import pytest
+
+
+def _make_entries(n: int) -> list[dict]:
+    return [
+        {"type": "chemical", "cortisol": 8.0 + i, "lactate": 1.5, "timestamp": 1000.0 + i}
+        for i in range(n)
+    ]
+
+
+class TestIncrementalMerkle:
+    """Tests for the append-only frontier tree."""
+
+    @pytest.mark.parametrize("n", list(range(1, 34)))
+    def test_matches_full_rebuild(self, n):
+        """Incremental root must equal a full rebuild for any leaf count."""
+        entries = _make_entries(n)
+        tree = IncrementalMerkle()
+        for entry in entries:
+            tree.append(hash_leaf(entry))
+
+        full = ProofGenerator().build_merkle_tree(entries)
+        assert tree.leaf_count == full.leaf_count == n
+        assert tree.root == full.root
+
+    def test_single_leaf_root_is_leaf(self):
+        """A one-leaf tree's root is the leaf digest itself."""
+        leaf = hash_leaf({"type": "chemical"})
+        tree = IncrementalMerkle()
+        tree.append(leaf)
+        assert tree.root == leaf.hex()
+
+    def test_empty_tree_raises(self):
+        """An empty tree has no root."""
+        with pytest.raises(ValueError):
+            IncrementalMerkle().root
+
+    def test_snapshot_is_independent(self):
+        """Appending after a snapshot must not change the snapshot's root."""
+        tree = IncrementalMerkle()
+        for entry in _make_entries(5):
+            tree.append(hash_leaf(entry))
+        snap = tree.snapshot()
+        root = snap.root
+
+        tree.append(hash_leaf(_make_entries(6)[5]))
+        assert snap.root == root
+        assert snap.leaf_count == 5
+        assert tree.root != root
+
+    def test_send_from_incremental_tree(self):
+        """A proof sent from the incremental tree verifies against the full log."""
+        entries = _make_entries(10)
+        tree = IncrementalMerkle()
+        for entry in entries:
+            tree.append(hash_leaf(entry))
+
+        gen = ProofGenerator()
+        result = gen.send(tree)
+        assert result["leaf_count"] == 10
+        assert gen.verify_root(entries, result["merkle_root"])
+        assert not gen.verify_root(entries[:-1], result["merkle_root"])
+
+
+class TestMerkleTree:
+    """Tests for the full-rebuild tree."""
+
+    def test_from_digests_rejects_partial_digest(self):
+        """Packed digests must be whole 32-byte leaves."""
+        with pytest.raises(ValueError):
+            MerkleTree.from_digests(b"\x00" * 33)
+
+    def test_parallel_leaf_hashing_matches_serial(self):
+        """Chunked leaf hashing on an executor must give the same root."""
+        entries = _make_entries(37)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            gen = ProofGenerator(executor=pool)
+            gen.PARALLEL_MIN_LEAVES = 1
+            parallel = gen.build_merkle_tree(entries)
+
+        serial = ProofGenerator().build_merkle_tree(entries)
+        assert parallel.root == serial.root
+        assert parallel.leaf_count == 37
+
+    def test_proof_history_is_bounded(self):
+        """Only the most recent proofs are kept; the count covers all."""
+        gen = ProofGenerator(max_proofs=2)
+        for n in range(1, 5):
+            gen.build_and_send(_make_entries(n))
+
+        assert gen.proof_count == 4
+        assert [p.leaf_count for p in gen.proofs] == [3, 4]
+
+    def test_clear_keeps_history_bound(self):
+        """clear() forgets proofs but keeps max_proofs."""
+        gen = ProofGenerator(max_proofs=2)
+        gen.build_and_send(_make_entries(1))
+        gen.clear()
+        assert gen.proof_count == 0
+        assert gen.proofs == []
+
+        for n in range(1, 4):
+            gen.build_and_send(_make_entries(n))
+        assert [p.leaf_count for p in gen.proofs] == [2, 3]
+
+    def test_empty_log_raises(self):
+        """Building a proof from an empty log should raise ValueError."""
+        with pytest.raises(ValueError):
+            ProofGenerator().build_merkle_tree([])
+
+
+class TestPackEntry:
+    """Tests for the canonical binary leaf encoding."""
+
+    def test_chemical_entry_is_fixed_width(self):
+        """A known schema packs to a tag byte plus fixed-width doubles."""
+        packed = pack_entry(_make_entries(1)[0])
+        assert len(packed) == 1 + 3 * 8
+        assert packed[0] == 1
+
+    def test_extra_keys_fall_back_to_json(self):
+        """Fields outside the schema must still be committed to."""
+        entry = {**_make_entries(1)[0], "note": "spike"}
+        packed = pack_entry(entry)
+        assert packed[0] == 0
+        assert b"spike" in packed
+
+    def test_distinct_entries_have_distinct_leaves(self):
+        """Changing any field changes the leaf digest."""
+        base = _make_entries(1)[0]
+        assert hash_leaf(base) != hash_leaf({**base, "lactate": 1.6})
+
+    def test_bool_and_int_values_do_not_collide_with_floats(self):
+        """Only all-float entries take the binary path; the rest keep their types."""
+        base = _make_entries(1)[0]
+        as_bool = {**base, "lactate": True}
+        as_int = {**base, "lactate": 1}
+        as_float = {**base, "lactate": 1.0}
+        assert pack_entry(as_bool)[0] == pack_entry(as_int)[0] == 0
+        assert len({hash_leaf(as_bool), hash_leaf(as_int), hash_leaf(as_float)}) == 3
@@ -0,0 +1,124 @@
+"""
+Unit Tests — Batched Sensor Noise
+
+Tests that the NumPy sample pool refills on exhaustion, clips at the
+floor, and that sensors drop their pool when the scenario changes.
+Also covers the optical sensor's turbidity clamp, NaN included.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from sensors.chemical_sensor import ChemicalSensor, StressScenario
+from sensors.optical_sensor import OpticalSensor
+from sensors.sample_buffer import SampleBuffer
+
+
+class TestSampleBuffer:
+    """Tests for the batched noise pool."""
+
+    def test_refills_when_exhausted(self):
+        """More rows than one batch can be drawn."""
+        buf = SampleBuffer(loc=(0.0, 5.0), scale=(1.0, 1.0), batch=4)
+        rows = [buf.next() for _ in range(10)]
+        assert all(len(row) == 2 for row in rows)
+        assert len({tuple(row) for row in rows}) == 10
+
+    def test_floor_clips_negatives(self):
+        """Values below the floor are clipped once per refill."""
+        buf = SampleBuffer(loc=(-100.0,), scale=(1.0,), batch=16)
+        assert all(buf.next() == [0.0] for _ in range(16))
+
+    def test_decimals_rounds_pool(self):
+        """Samples come out already rounded to the requested decimals."""
+        buf = SampleBuffer(loc=(10.0,), scale=(3.0,), decimals=2, batch=32)
+        for _ in range(32):
+            (value,) = buf.next()
+            assert value == round(value, 2)
+
+    def test_rows_are_python_floats(self):
+        """Rows are plain floats, not NumPy scalars."""
+        buf = SampleBuffer(loc=(1.0,), scale=(0.1,), rng=np.random.default_rng(0))
+        assert type(buf.next()[0]) is float
+
+    @pytest.mark.asyncio
+    async def test_async_prefetch_matches_sync_draws(self):
+        """Background refills yield the same stream as synchronous ones."""
+        sync_buf = SampleBuffer(loc=(0.0,), scale=(1.0,), batch=4,
+                                rng=np.random.default_rng(3))
+        async_buf = SampleBuffer(loc=(0.0,), scale=(1.0,), batch=4,
+                                 rng=np.random.default_rng(3))
+        expected = [sync_buf.next() for _ in range(10)]
+        assert [await async_buf.next_async() for _ in range(10)] == expected
+
+    @pytest.mark.asyncio
+    async def test_concurrent_async_reads_get_distinct_rows(self):
+        """Callers waiting on the same prefetch must not share a row."""
+        sync_buf = SampleBuffer(loc=(0.0,), scale=(1.0,), batch=4,
+                                rng=np.random.default_rng(5))
+        async_buf = SampleBuffer(loc=(0.0,), scale=(1.0,), batch=4,
+                                 rng=np.random.default_rng(5))
+        expected = [sync_buf.next() for _ in range(20)]
+        rows = await asyncio.gather(*(async_buf.next_async() for _ in range(20)))
+        assert sorted(rows) == sorted(expected)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_reader_leaves_prefetch_usable(self):
+        """Cancelling a caller waiting on the prefetch must not cancel it."""
+        buf = SampleBuffer(loc=(0.0,), scale=(1.0,), batch=4)
+        prefetch = asyncio.get_running_loop().create_future()
+        buf._prefetch = prefetch  # Pool is empty: the next read waits on this
+
+        reader = asyncio.create_task(buf.next_async())
+        await asyncio.sleep(0)
+        reader.cancel()
+        await asyncio.gather(reader, return_exceptions=True)
+        assert not prefetch.cancelled()
+
+        prefetch.set_result([[7.0]] * 4)
+        assert await buf.next_async() == [7.0]
+
+    def test_mismatched_params_raise(self):
+        """loc and scale must describe the same columns."""
+        with pytest.raises(ValueError):
+            SampleBuffer(loc=(0.0, 1.0), scale=(1.0,))
+
+
+class TestScenarioSwitch:
+    """Tests that a scenario change takes effect on the next read."""
+
+    @pytest.mark.asyncio
+    async def test_scenario_change_discards_pool(self):
+        """Readings after a switch come from the new scenario's profile."""
+        sensor = ChemicalSensor(StressScenario.CLEAR_LOW_STRESS)
+        await sensor.read()  # Fill the clear-water pool
+
+        sensor.scenario = StressScenario.MURKY_HIGH_STRESS
+        readings = [await sensor.read() for _ in range(20)]
+        mean = sum(r.cortisol_ng_ml for r in readings) / len(readings)
+        assert mean > 30.0
+
+    @pytest.mark.asyncio
+    async def test_seeded_sensors_are_reproducible(self):
+        """Sensors built with the same seed produce the same readings."""
+        a = ChemicalSensor(seed=7)
+        b = ChemicalSensor(seed=7)
+        for scenario in (StressScenario.CLEAR_LOW_STRESS, StressScenario.TRANSITION):
+            a.scenario = b.scenario = scenario
+            for _ in range(5):
+                ra, rb = await a.read(now=0.0), await b.read(now=0.0)
+                assert ra == rb
+
+
+class TestTurbidityFactor:
+    """Tests for the optical sensor's turbidity clamp."""
+
+    @pytest.mark.parametrize("value, expected", [
+        (-0.5, 0.0), (0.3, 0.3), (2.0, 1.0), (float("nan"), 0.0),
+    ])
+    def test_setter_clamps(self, value, expected):
+        sensor = OpticalSensor()
+        sensor.turbidity_factor = value
+        assert sensor.turbidity_factor == expected
@@ -0,0 +1,104 @@
+"""
+Unit Tests — Sensor Log Ring Buffer
+
+Tests that the fixed-capacity sensor log keeps entries in order,
+overwrites the oldest when full, and reproduces recorded entries exactly.
+"""
+
+import logging
+
+from edge_node.sensor_log import ENTRY_FIELDS, SensorLogRing
+from edge_node.state_machine import EdgeController
+from blockchain.proof_generator import hash_leaf
+import pytest
+
+
+def _chemical(i: int) -> dict:
+    return {"type": "chemical", "cortisol": 8.25 + i, "lactate": 1.5, "timestamp": 1000.0 + i}
+
+
+def _active_cycle(twis: float) -> dict:
+    entry = {"type": "active_cycle"}
+    entry.update((name, 1.0) for name in ENTRY_FIELDS["active_cycle"])
+    entry["twis"] = twis
+    return entry
+
+
+class TestSensorLogRing:
+    """Tests for the NumPy-backed sensor log."""
+
+    def test_round_trip_is_exact(self):
+        """Dict view of a row must hash to the same Merkle leaf."""
+        ring = SensorLogRing(capacity=4)
+        entry = _chemical(0)
+        ring.append(entry)
+        assert ring.to_dicts() == [entry]
+        assert hash_leaf(ring.to_dicts()[0]) == hash_leaf(entry)
+
+    def test_wraparound_keeps_newest_in_order(self):
+        """Once full, the oldest rows are overwritten."""
+        ring = SensorLogRing(capacity=3)
+        for i in range(5):
+            ring.append(_chemical(i))
+
+        assert len(ring) == 3
+        assert ring.total_appended == 5
+        assert list(ring.rows()["timestamp"]) == [1002.0, 1003.0, 1004.0]
+
+    def test_filter_by_type(self):
+        """rows(entry_type) only returns rows of that type."""
+        ring = SensorLogRing(capacity=8)
+        ring.append(_chemical(0))
+        ring.append(_active_cycle(0.9))
+        assert list(ring.rows("active_cycle")["twis"]) == [0.9]
+
+    def test_clear_forgets_entries(self):
+        """A cleared ring is empty and refills from the start."""
+        ring = SensorLogRing(capacity=3)
+        for i in range(5):
+            ring.append(_chemical(i))
+        ring.clear()
+        assert len(ring) == 0
+
+        ring.append(_chemical(9))
+        assert ring.to_dicts() == [_chemical(9)]
+
+    def test_unknown_type_raises(self):
+        """Entries outside the known schemas are rejected."""
+        with pytest.raises(ValueError):
+            SensorLogRing().append({"type": "sonar"})
+
+    def test_unknown_key_raises(self):
+        """A key the row cannot store is rejected, not silently dropped."""
+        with pytest.raises(ValueError, match="note"):
+            SensorLogRing().append({**_chemical(0), "note": "spike"})
+
+    def test_missing_key_raises(self):
+        """An entry missing one of its type's fields is rejected."""
+        entry = _chemical(0)
+        del entry["lactate"]
+        with pytest.raises(ValueError, match="lactate"):
+            SensorLogRing().append(entry)
+
+    def test_non_float_value_raises(self):
+        """An int would come back as a float and hash to a different leaf."""
+        with pytest.raises(ValueError, match="lactate"):
+            SensorLogRing().append({**_chemical(0), "lactate": 1})
+
+
+class TestControllerLogWrap:
+    """Tests that the controller flags a wrapping sensor log."""
+
+    def test_warns_once_when_ring_wraps(self, caplog):
+        """Overwriting starts with a single warning."""
+        ctrl = EdgeController(sensor_log_capacity=2)
+        with caplog.at_level(logging.WARNING, logger="guardian_oracle.state_machine"):
+            for i in range(2):
+                ctrl._record_sensor_entry(_chemical(i))
+            assert not caplog.records
+
+            for i in range(2, 5):
+                ctrl._record_sensor_entry(_chemical(i))
+        assert len(caplog.records) == 1
+        assert "Sensor log full" in caplog.records[0].getMessage()
+        assert ctrl.incremental_tree.leaf_count == 5
@@ -8,11 +8,14 @@ In production, this would interface with electrochemical biosensors.
 from __future__ import annotations
 
 import asyncio
-import random
 import time
 from dataclasses import dataclass, field
 from enum import Enum
 
+import numpy as np
+
+from sensors.sample_buffer import SampleBuffer
+
 
 class StressScenario(Enum):
     """Pre-defined simulation scenarios for the chemical sensor."""
@@ -21,18 +24,17 @@ class StressScenario(Enum):
     TRANSITION = "transition"
 
 
-@dataclass
+@dataclass(slots=True)
 class ChemicalReading:
     """A single reading from the chemical biosensor array."""
     cortisol_ng_ml: float       # Cortisol concentration (ng/mL)
     lactate_mmol_l: float       # Lactate concentration (mmol/L)
-    timestamp: float = field(default_factory=time.time)
+    timestamp: float
     sensor_id: str = "CHEM-01"
+    is_stressed: bool = field(init=False, compare=False)  # Cortisol above limit
 
-    @property
-    def is_stressed(self) -> bool:
-        """Quick check if readings indicate ecological stress."""
-        return self.cortisol_ng_ml > CORTISOL_LIMIT
+    def __post_init__(self) -> None:
+        self.is_stressed = self.cortisol_ng_ml > CORTISOL_LIMIT
 
     def __repr__(self) -> str:
         return (
@@ -71,10 +73,37 @@ class ChemicalSensor:
     electrochemical impedance spectroscopy (EIS) chip.
     """
 
-    def __init__(self, scenario: StressScenario = StressScenario.CLEAR_LOW_STRESS):
+    ADC_DELAY_S = 0.01  # Simulated ADC delay (accelerated); 0 just yields
+
+    def __init__(
+        self,
+        scenario: StressScenario = StressScenario.CLEAR_LOW_STRESS,
+        seed: int | None = None,
+    ):
+        """
+        Args:
+            scenario: Initial stress scenario.
+            seed: Seed for this sensor's noise generator (None for a
+                fresh, unpredictable stream). Fixes the readings for
+                reproducible runs.
+        """
+        # Each pool gets its own child stream, so a background refill of a
+        # discarded pool never shares a generator with its replacement
+        self._seeds = np.random.SeedSequence(seed)
         self._scenario = scenario
+        self._samples = self._make_samples(scenario)
         self._read_count = 0
 
+    def _make_samples(self, scenario: StressScenario) -> SampleBuffer:
+        """Noise pool of (cortisol, lactate) rows for a scenario."""
+        profile = _PROFILES[scenario]
+        return SampleBuffer(
+            loc=(profile["cortisol_mean"], profile["lactate_mean"]),
+            scale=(profile["cortisol_std"], profile["lactate_std"]),
+            decimals=2,
+            rng=np.random.default_rng(self._seeds.spawn(1)[0]),
+        )
+
     @property
     def scenario(self) -> StressScenario:
         return self._scenario
@@ -82,27 +111,32 @@ class ChemicalSensor:
     @scenario.setter
     def scenario(self, value: StressScenario) -> None:
         self._scenario = value
+        self._samples = self._make_samples(value)  # Drop the old scenario's pool
 
-    async def read(self) -> ChemicalReading:
+    async def read(self, now: float | None = None) -> ChemicalReading:
         """
         Perform an asynchronous sensor read.
         Simulates ~100ms ADC acquisition time.
+
+        Args:
+            now: Timestamp to stamp the reading with (e.g. simulated
+                time). Defaults to the wall clock.
         """
-        await asyncio.sleep(0.01)  # Simulated ADC delay (accelerated)
+        await asyncio.sleep(self.ADC_DELAY_S)
 
-        profile = _PROFILES[self._scenario]
-        cortisol = max(0.0, random.gauss(profile["cortisol_mean"], profile["cortisol_std"]))
-        lactate = max(0.0, random.gauss(profile["lactate_mean"], profile["lactate_std"]))
+        cortisol, lactate = await self._samples.next_async()
 
         self._read_count += 1
         return ChemicalReading(
-            cortisol_ng_ml=round(cortisol, 2),
-            lactate_mmol_l=round(lactate, 2),
+            cortisol_ng_ml=cortisol,
+            lactate_mmol_l=lactate,
+            timestamp=time.time() if now is None else now,
         )
 
     def reset(self) -> None:
-        """Reset the sensor read counter."""
+        """Reset the sensor read counter and drop the pooled noise."""
         self._read_count = 0
+        self._samples.discard()
 
     @property
     def read_count(self) -> int:
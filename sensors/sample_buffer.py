@@ -0,0 +1,121 @@
+"""
+Sample Buffer — Batched Gaussian Noise for Simulated Sensors
+
+Draws simulation noise in NumPy batches instead of one `random.gauss`
+call per value. Each `next()` pops one precomputed row; the pool is
+refilled, clipped and rounded in a few vectorised calls when exhausted.
+
+Async callers use `next_async()`, which draws the following batch on a
+worker thread once the current one is half used, so refills stay off
+the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Sequence
+
+import numpy as np
+
+BATCH = 1024  # Rows drawn per refill
+
+
+class SampleBuffer:
+    """
+    Pool of normally distributed rows, refilled `batch` rows at a time.
+
+    Each row holds one sample per (loc, scale) pair. Rows are handed out
+    as plain Python floats so callers pay no NumPy scalar overhead.
+    """
+
+    def __init__(
+        self,
+        loc: Sequence[float],
+        scale: Sequence[float],
+        floor: float | None = 0.0,
+        decimals: int | None = None,
+        batch: int = BATCH,
+        rng: np.random.Generator | None = None,
+    ):
+        """
+        Args:
+            loc: Mean of each column.
+            scale: Standard deviation of each column.
+            floor: Lower clip applied once per refill (None to disable).
+            decimals: Round every sample to this many decimals once per
+                refill (None to keep full precision).
+            batch: Rows drawn per refill.
+            rng: Random generator; a fresh unseeded one by default.
+        """
+        if len(loc) != len(scale):
+            raise ValueError(f"loc and scale differ in length: {len(loc)} vs {len(scale)}")
+
+        self._loc = tuple(loc)
+        self._scale = tuple(scale)
+        self._floor = floor
+        self._decimals = decimals
+        self._batch = batch
+        self._rng = rng if rng is not None else np.random.default_rng()
+        self._rows: list[list[float]] = []
+        self._idx = 0
+        self._prefetch: asyncio.Future[list[list[float]]] | None = None
+
+    def next(self) -> list[float]:
+        """Pop the next row of samples, refilling the pool if exhausted."""
+        if self._idx >= len(self._rows):
+            self._refill()
+        row = self._rows[self._idx]
+        self._idx += 1
+        return row
+
+    async def next_async(self) -> list[float]:
+        """
+        Pop the next row, drawing the following batch in the background.
+
+        The next batch is started on a worker thread once the current one
+        is half used; it is only awaited if the pool runs dry first. When
+        several callers wait on the same prefetch, only the first swaps it
+        in; the rest re-check the pool and take the following rows. The
+        prefetch is shielded, so a cancelled caller leaves it to the next.
+        """
+        while self._idx >= len(self._rows):
+            prefetch = self._prefetch
+            if prefetch is None:
+                self._refill()
+            else:
+                rows = await asyncio.shield(prefetch)
+                if self._prefetch is prefetch:  # Not yet swapped in by another caller
+                    self._rows = rows
+                    self._idx = 0
+                    self._prefetch = None
+
+        row = self._rows[self._idx]
+        self._idx += 1
+
+        if self._prefetch is None and self._idx * 2 >= len(self._rows):
+            self._prefetch = asyncio.ensure_future(asyncio.to_thread(self._draw))
+        return row
+
+    def discard(self) -> None:
+        """
+        Drop the remaining pool and any in-flight prefetch.
+
+        The prefetch is abandoned rather than cancelled: it may belong to
+        an event loop that has since closed.
+        """
+        self._rows = []
+        self._idx = 0
+        self._prefetch = None
+
+    def _refill(self) -> None:
+        self._rows = self._draw()
+        self._idx = 0
+
+    def _draw(self) -> list[list[float]]:
+        """Draw, clip and round one batch of rows."""
+        pool = self._rng.normal(self._loc, self._scale, size=(self._batch, len(self._loc)))
+        if self._floor is not None:
+            np.maximum(pool, self._floor, out=pool)
+        if self._decimals is not None:
+            np.round(pool, self._decimals, out=pool)
+        return pool.tolist()
@@ -0,0 +1,145 @@
+"""
+Unit Tests — Vision Model Micro-Batching
+
+Tests that frames sent to the production network are batched into one
+forward pass, that a failed pass reaches every waiting frame, and that
+unloading the model mid-batch leaves no frame waiting forever. The
+network is stubbed, so these run without PyTorch.
+"""
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from ai_models.vision_model import VisionModel
+
+
+class _StubNet:
+    """Stands in for the TorchScript network: one row per frame."""
+
+    def __init__(self, fail: bool = False):
+        self.batches: list[int] = []
+        self.fail = fail
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+
+    def forward(self, net, frames):
+        self.batches.append(len(frames))
+        self.started.set()
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("forward failed")
+        # Counts for each species, then confidence; jellyfish = frame value
+        return [[float(f[0]), 0.0, 0.0, 0.0, 0.9] for f in frames]
+
+
+def _loaded_model(stub: _StubNet, **kwargs) -> VisionModel:
+    model = VisionModel(model_path="missing.pt", **kwargs)
+    model._net = stub
+    model._forward = stub.forward
+    model._precision = "fp32"
+    model._is_loaded = True
+    return model
+
+
+def _frame(value: float) -> np.ndarray:
+    return np.full(1, value, dtype=np.float32)
+
+
+class TestMicroBatching:
+    """Tests for the batched production inference path."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_frames_share_one_forward(self):
+        """Frames queued together run in a single pass, results in order."""
+        stub = _StubNet()
+        model = _loaded_model(stub, max_batch=8)
+        results = await asyncio.gather(
+            *(model.infer(i, frame=_frame(i)) for i in range(3))
+        )
+        assert stub.batches == [3]
+        assert [r.species_counts["jellyfish"] for r in results] == [0, 1, 2]
+        assert all(r.precision == "fp32" for r in results)
+
+    @pytest.mark.asyncio
+    async def test_batches_capped_at_max_batch(self):
+        stub = _StubNet()
+        model = _loaded_model(stub, max_batch=2)
+        await asyncio.gather(*(model.infer(i, frame=_frame(i)) for i in range(5)))
+        assert sum(stub.batches) == 5
+        assert max(stub.batches) <= 2
+
+    @pytest.mark.asyncio
+    async def test_single_frame_skips_batch_window(self):
+        """A lone frame must not wait out the batch window."""
+        stub = _StubNet()
+        model = _loaded_model(stub, batch_window=30.0)
+        result = await asyncio.wait_for(model.infer(0, frame=_frame(4)), timeout=5)
+        assert result.species_counts["jellyfish"] == 4
+
+    @pytest.mark.asyncio
+    async def test_forward_error_reaches_every_frame(self):
+        stub = _StubNet(fail=True)
+        model = _loaded_model(stub)
+        results = await asyncio.gather(
+            *(model.infer(i, frame=_frame(i)) for i in range(3)),
+            return_exceptions=True,
+        )
+        assert stub.batches == [3]
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    @pytest.mark.asyncio
+    async def test_unload_during_batch_resolves_all_frames(self):
+        """The running batch finishes; frames still queued fail cleanly."""
+        stub = _StubNet()
+        stub.release.clear()
+        model = _loaded_model(stub, max_batch=1)
+        tasks = [asyncio.create_task(model.infer(i, frame=_frame(i))) for i in range(2)]
+
+        await asyncio.to_thread(stub.started.wait, 5)
+        model.unload()
+        stub.release.set()
+
+        running, queued = await asyncio.wait_for(
+            asyncio.gather(*tasks, return_exceptions=True), timeout=5
+        )
+        assert running.species_counts["jellyfish"] == 0
+        assert running.precision == "fp32"
+        assert isinstance(queued, RuntimeError)
+        assert stub.batches == [1]
+
+
+class TestQuantize:
+    """Tests for int8 post-training quantization."""
+
+    @pytest.mark.asyncio
+    async def test_no_calibration_frames_raises(self, tmp_path):
+        """Checked before torch is needed, so this runs without it."""
+        model = VisionModel(model_path=str(tmp_path / "net.pt"))
+        with pytest.raises(ValueError):
+            await model.quantize(object(), iter([]))
+        with pytest.raises(ValueError):
+            await model.quantize(object(), [_frame(1.0)], num_calib_frames=0)
+
+    @pytest.mark.asyncio
+    async def test_quantize_leaves_caller_model_untouched(self, tmp_path):
+        torch = pytest.importorskip("torch")
+        net = torch.nn.Sequential(
+            torch.nn.Conv2d(3, 4, 3),
+            torch.nn.ReLU(),
+            torch.nn.Flatten(),
+            torch.nn.Linear(4 * 6 * 6, 5),
+        ).train()
+        engine = torch.backends.quantized.engine
+        frames = [np.random.rand(3, 8, 8).astype(np.float32) for _ in range(4)]
+
+        model = VisionModel(model_path=str(tmp_path / "net.pt"))
+        path = await model.quantize(net, frames)
+
+        assert path == model.int8_model_path
+        assert (tmp_path / "net.int8.pt").exists()
+        assert net.training
+        assert torch.backends.quantized.engine == engine